@@ -4,8 +4,20 @@
 # Description: Finds all files ending in '.ex' that have more than a specified
 #              number of lines, displays the line count, and sorts the results.
 # Usage: ./find_large_ex_files.sh [MIN_LINES]
+#        ./find_large_ex_files.sh --report [codeReport.py options...]
 #   MIN_LINES: The minimum number of lines a file must have to be included.
 #              Defaults to 500 if not provided.
+#   --report:  Hands off to scripts/codeReport.py, which also covers .exs, .heex
+#              and .py files and reports bytes, blank/comment ratios and the
+#              largest function (see --help there for --ext, --top, --json).
+
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+
+# --- Report Mode ---
+if [ "$1" = "--report" ]; then
+    shift
+    exec python3 "$SCRIPT_DIR/../scripts/codeReport.py" "$@"
+fi
 
 # --- Configuration ---
 # Set the default minimum line count if no argument is provided
@@ -15,28 +27,26 @@ MIN_LINES=${1:-500}
 echo "Searching for files ending in '.ex' with more than $MIN_LINES lines..."
 echo "---------------------------------------------------------------------"
 
-# Use find to locate files, execute a bash subshell for each file:
+# Use the shared walker (scripts/fileWalk.py) to list '.ex' files. It prunes
+# deps/, _build/, node_modules/, .git and .gitignore'd directories before
+# descending, so only the project's own sources are visited. For each file:
 # 1. Count the lines in the file using 'wc -l'.
 # 2. Check if the line count exceeds the MIN_LINES threshold.
 # 3. If it does, print the line count followed by the filename.
-# The output of all these commands is then piped to 'sort -n' to sort numerically.
-find . -name "*.ex" -exec bash -c '
-    # Assign the current file path from find (which is $1 in the subshell)
-    file_path="$1"
-    # Assign the minimum lines threshold passed as the second argument ($2)
-    min_lines_threshold="$2"
-
+# The output is then piped to 'sort -n' to sort numerically.
+python3 "$SCRIPT_DIR/../scripts/fileWalk.py" . --list-files --ext .ex -0 |
+while IFS= read -r -d '' file_path; do
     # Count the lines in the file. Using "< $file_path" prevents wc from
     # printing the filename itself, giving us just the number.
     line_count=$(wc -l < "$file_path")
 
     # Check if the counted lines are greater than the threshold
-    if (( line_count > min_lines_threshold )); then
+    if (( line_count > MIN_LINES )); then
         # Print the line count and the file path, separated by a space.
         # This format is ideal for numerical sorting.
         echo "$line_count $file_path"
     fi
-' _ {} "$MIN_LINES" \; | sort -n
+done | sort -n
 
 echo "---------------------------------------------------------------------"
 echo "Search complete."
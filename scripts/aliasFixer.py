@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+"""
+Construct-aware fixer for Elixir 'unused alias' warnings, used by prependComment.py.
+
+Commenting out only the reported line breaks multi-line constructs such as
+
+    alias MyApp.{
+      Accounts,
+      Repo
+    }
+
+so instead we tokenize just the region around each reported line (tracking
+brackets, strings, comments and do/fn/end depth) to find the whole `alias`
+construct, then either comment all of its lines or, when only some names of a
+`Prefix.{A, B}` group are unused, rewrite the group without them.
+
+Edits are returned as hunks (start_index, old_lines, new_lines) against the
+file's list of lines, so the caller can apply all edits for a file in one write.
+"""
+
+import re
+
+# --- Configuration ---
+MAX_LOOKBACK_LINES = 50   # How far above a reported line to look for its `alias`.
+MAX_CONSTRUCT_LINES = 200  # Give up on constructs longer than this (likely a parse miss).
+COMMENT_PREFIX = "# "
+# --- End Configuration ---
+
+# e.g. "warning: unused alias Repo" -> "Repo"
+UNUSED_ALIAS_NAME_PATTERN = re.compile(r"unused alias ([\w.]+)")
+ALIAS_START_PATTERN = re.compile(r"^\s*alias\s")
+# "alias MyApp.{A, B.C}" with an optional trailer (e.g. a comment) after "}".
+GROUP_ALIAS_PATTERN = re.compile(r"^(\s*)alias\s+([\w.]+)\.\{(.*)\}(.*)$", re.DOTALL)
+# "alias MyApp.Repo" or "alias MyApp.Repo, as: R"
+SINGLE_ALIAS_PATTERN = re.compile(r"^\s*alias\s+([\w.]+)(?:\s*,\s*as:\s*(\w+))?")
+BLOCK_KEYWORD_PATTERN = re.compile(r"\b(do|fn|end)\b(?!:)")
+CONTINUATION_SUFFIXES = (",", ".", "\\", "|", "=", "+", "-", "*", "/", "&", "<", ">")
+
+
+def alias_name_from_warning(warning_text):
+    """Extracts 'Repo' from 'warning: unused alias Repo', or None."""
+    if not warning_text:
+        return None
+    match = UNUSED_ALIAS_NAME_PATTERN.search(warning_text)
+    return match.group(1) if match else None
+
+
+def _code_part(line, in_string):
+    """
+    Strips string contents and trailing comments from one line.
+
+    Args:
+        line (str): The source line.
+        in_string (str or None): The quote character of a string still open from
+                                 previous lines, or None.
+
+    Returns:
+        tuple: (code_without_strings_or_comments, in_string_at_end_of_line)
+    """
+    code = []
+    i = 0
+    n = len(line)
+    while i < n:
+        c = line[i]
+        if in_string:
+            if c == "\\":
+                i += 2
+                continue
+            if c == in_string:
+                in_string = None
+            i += 1
+            continue
+        if c == "#":
+            break
+        if c in ('"', "'"):
+            in_string = c
+        elif c == "?" and i + 1 < n:
+            # Character literals like ?" or ?{ must not open strings or brackets.
+            code.append(" ")
+            i += 2
+            continue
+        else:
+            code.append(c)
+        i += 1
+    return "".join(code), in_string
+
+
+def find_construct_end(lines, start_index):
+    """
+    Finds the last line of the expression starting at `start_index`.
+
+    The expression ends on the first line where bracket and do/fn/end depth are
+    back to zero, no string is open, and the line does not end with a
+    continuation token (e.g. a trailing comma before `as:`).
+
+    Returns:
+        int: The 0-indexed last line, or None if no end was found nearby.
+    """
+    depth = 0
+    in_string = None
+    last_index = min(len(lines), start_index + MAX_CONSTRUCT_LINES)
+    for index in range(start_index, last_index):
+        code, in_string = _code_part(lines[index], in_string)
+        for c in code:
+            if c in "([{":
+                depth += 1
+            elif c in ")]}":
+                depth -= 1
+        for match in BLOCK_KEYWORD_PATTERN.finditer(code):
+            depth += -1 if match.group(1) == "end" else 1
+
+        if depth <= 0 and in_string is None and not code.rstrip().endswith(CONTINUATION_SUFFIXES):
+            return index
+    return None
+
+
+def find_alias_construct(lines, line_index):
+    """
+    Locates the `alias` construct covering a reported (0-indexed) line.
+
+    Returns:
+        tuple: (start_index, end_index), or None if the line is not part of an alias.
+    """
+    lowest = max(0, line_index - MAX_LOOKBACK_LINES)
+    for start_index in range(line_index, lowest - 1, -1):
+        if ALIAS_START_PATTERN.match(lines[start_index]):
+            end_index = find_construct_end(lines, start_index)
+            if end_index is not None and end_index >= line_index:
+                return start_index, end_index
+            return None
+    return None
+
+
+def _split_group_names(body):
+    """Splits the inside of '{...}' into names, dropping comments and blanks."""
+    names = []
+    for raw_line in body.split("\n"):
+        code, _ = _code_part(raw_line, None)
+        for name in code.split(","):
+            name = name.strip()
+            if name:
+                names.append(name)
+    return names
+
+
+def _comment_out(old_lines):
+    return [line if line.lstrip().startswith(COMMENT_PREFIX) else f"{COMMENT_PREFIX}{line}"
+            for line in old_lines]
+
+
+def _rewrite_group(old_lines, indent, prefix, remaining, trailer):
+    """Rebuilds 'alias Prefix.{...}' with only `remaining`, keeping single- or multi-line layout."""
+    newline = "\n" if old_lines[-1].endswith("\n") else ""
+    trailer = trailer.rstrip("\n")
+    if len(remaining) == 1:
+        return [f"{indent}alias {prefix}.{remaining[0]}{trailer}{newline}"]
+    if len(old_lines) == 1:
+        return [f"{indent}alias {prefix}.{{{', '.join(remaining)}}}{trailer}{newline}"]
+
+    inner_indent = indent + "  "
+    for line in old_lines[1:-1]:
+        if line.strip():
+            inner_indent = line[:len(line) - len(line.lstrip())]
+            break
+    new_lines = [f"{indent}alias {prefix}.{{\n"]
+    for position, name in enumerate(remaining):
+        separator = "," if position < len(remaining) - 1 else ""
+        new_lines.append(f"{inner_indent}{name}{separator}\n")
+    new_lines.append(f"{indent}}}{trailer}{newline}")
+    return new_lines
+
+
+def plan_construct_edit(lines, start_index, end_index, unused_names):
+    """
+    Builds the hunk that removes `unused_names` from one alias construct.
+
+    Args:
+        lines (list): The file's lines.
+        start_index, end_index (int): The construct's span (inclusive, 0-indexed).
+        unused_names (set): Short alias names reported as unused. An empty set
+                            (names unknown) comments out the whole construct.
+
+    Returns:
+        tuple: (start_index, old_lines, new_lines)
+    """
+    old_lines = lines[start_index:end_index + 1]
+    text = "".join(old_lines)
+
+    group = GROUP_ALIAS_PATTERN.match(text)
+    if group and unused_names:
+        indent, prefix, body, trailer = group.groups()
+        names = _split_group_names(body)
+        remaining = [name for name in names if name.rsplit(".", 1)[-1] not in unused_names]
+        if remaining and len(remaining) < len(names):
+            return start_index, old_lines, _rewrite_group(old_lines, indent, prefix, remaining, trailer)
+        if remaining:
+            return start_index, old_lines, list(old_lines)  # Reported names not in this group.
+
+    if not group and unused_names:
+        single = SINGLE_ALIAS_PATTERN.match(text)
+        if single:
+            defined_name = single.group(2) or single.group(1).rsplit(".", 1)[-1]
+            if defined_name not in unused_names:
+                return start_index, old_lines, list(old_lines)
+
+    return start_index, old_lines, _comment_out(old_lines)
+
+
+def plan_alias_edits(lines, reports):
+    """
+    Plans edits for all unused-alias reports in one file.
+
+    Reports that fall in the same construct are merged, so a group with several
+    unused names is rewritten once.
+
+    Args:
+        lines (list): The file's lines (as from readlines()).
+        reports (list): (line_number, alias_name_or_None) tuples, 1-indexed lines.
+
+    Returns:
+        tuple: (hunks, problems) where problems is a list of (line_number, message).
+    """
+    constructs = {}
+    problems = []
+    for line_number, alias_name in reports:
+        line_index = line_number - 1
+        if not 0 <= line_index < len(lines):
+            problems.append((line_number, f"Line number {line_number} is out of range (Total lines: {len(lines)})"))
+            continue
+        span = find_alias_construct(lines, line_index)
+        if span is None:
+            problems.append((line_number, f"No alias construct found around line {line_number}"))
+            continue
+        names = constructs.setdefault(span, set())
+        if alias_name:
+            names.add(alias_name.rsplit(".", 1)[-1])
+
+    hunks = []
+    for (start_index, end_index), names in sorted(constructs.items()):
+        hunk = plan_construct_edit(lines, start_index, end_index, names)
+        if hunk[1] != hunk[2]:
+            hunks.append(hunk)
+        else:
+            problems.append((start_index + 1, f"Unused alias(es) {', '.join(sorted(names))} not found in "
+                                              f"the alias at lines {start_index + 1}-{end_index + 1}"))
+    return hunks, problems
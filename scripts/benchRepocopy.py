@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""
+Offline peak-memory benchmark for repocopy.py.
+
+Builds a throwaway project with lib/, test/ and examples/, and puts fake
+`repomix` (writes a repomix-output.xml of the requested size) and `xclip`
+(drains stdin) executables on PATH. It then runs repocopy.py for option 6
+(lib, test, examples) in clipboard mode and with --out, and reports wall time
+and peak RSS from wait4():
+
+    benchRepocopy.py --mb 100
+    benchRepocopy.py --mb 100 --script /tmp/old/repocopy.py --clipboard-only
+
+--script benchmarks another copy of repocopy.py (e.g. from an older commit).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from benchWarnings import run_measured
+
+# --- Configuration ---
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPOCOPY_SCRIPT = os.path.join(SCRIPTS_DIR, "repocopy.py")
+BENCH_OPTION = "6"                     # lib, test, examples
+BENCH_DIRS = ["lib", "test", "examples"]
+DEFAULT_MB_PER_DIR = 100
+# --- End Configuration ---
+
+FAKE_REPOMIX_SOURCE = """#!{python}
+# Fake `repomix` for benchRepocopy.py: writes a repomix-output.xml of fixed size.
+chunk = (b"<file path='x.ex'>" + b"x" * 1005 + b"</file>\\n") * 1024
+with open("repomix-output.xml", "wb") as f:
+    for _ in range({mb}):
+        f.write(chunk)
+"""
+
+FAKE_XCLIP_SOURCE = """#!{python}
+# Fake `xclip` for benchRepocopy.py: drains stdin like the real clipboard tool.
+import sys
+while sys.stdin.buffer.read(1024 * 1024):
+    pass
+"""
+
+
+def install_fakes(work_dir, mb_per_dir):
+    """Creates a bin/ dir with the fake repomix and xclip. Returns the bin dir."""
+    bin_dir = os.path.join(work_dir, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    for name, source in (("repomix", FAKE_REPOMIX_SOURCE), ("xclip", FAKE_XCLIP_SOURCE)):
+        path = os.path.join(bin_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source.format(python=sys.executable, mb=mb_per_dir))
+        os.chmod(path, 0o755)
+    return bin_dir
+
+
+def make_project(work_dir):
+    project = os.path.join(work_dir, "project")
+    for dir_name in BENCH_DIRS:
+        os.makedirs(os.path.join(project, dir_name), exist_ok=True)
+        with open(os.path.join(project, dir_name, "placeholder.ex"), "w", encoding="utf-8") as f:
+            f.write("defmodule Placeholder do\nend\n")
+    return project
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measures repocopy.py peak RSS against fake repomix/xclip.")
+    parser.add_argument("--mb", type=int, default=DEFAULT_MB_PER_DIR,
+                        help=f"Size of each fake repomix output in MiB. Defaults to {DEFAULT_MB_PER_DIR}.")
+    parser.add_argument("--script", default=REPOCOPY_SCRIPT, help="repocopy.py to benchmark.")
+    parser.add_argument("--clipboard-only", action="store_true",
+                        help="Skip the --out run (for versions without --out).")
+    parser.add_argument("-o", "--output", help="Also write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="benchRepocopy-")
+    try:
+        bin_dir = install_fakes(work_dir, args.mb)
+        project = make_project(work_dir)
+        env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""),
+                   XDG_CACHE_HOME=os.path.join(work_dir, "cache"))
+        script = os.path.abspath(args.script)
+
+        modes = [("clipboard", [])]
+        if not args.clipboard_only:
+            modes.append(("out", ["--out", os.path.join(work_dir, "combined.txt")]))
+
+        payload_mb = args.mb * len(BENCH_DIRS)
+        print(f"repocopy: {script}\npayload: {payload_mb} MiB ({len(BENCH_DIRS)} x {args.mb} MiB)")
+        results = {"script": script, "payload_mb": payload_mb, "modes": {}}
+        for mode, extra in modes:
+            seconds, rss_kb, code = run_measured([sys.executable, script, BENCH_OPTION] + extra,
+                                                 cwd=project, env=env)
+            results["modes"][mode] = {"seconds": round(seconds, 3), "peak_rss_kb": rss_kb, "exit_code": code}
+            status = "" if code == 0 else f"  (exit {code})"
+            print(f"  {mode:<10} {seconds:>8.2f}s  peak RSS {rss_kb / 1024:>8.1f} MiB{status}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
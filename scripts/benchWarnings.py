@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+"""
+Offline benchmark suite for the warning-fix toolchain in scripts/.
+
+For each warning count it generates a synthetic `mix compile` output (mixed
+warning categories and all the '└─ path:line[:col][: Module]' variants) plus a
+matching synthetic Elixir source tree, puts a fake `mix` executable on PATH
+that replays the corpus, and measures:
+
+  parse     findWarningsByPrefix.py over the saved corpus (throughput, peak RSS)
+  prepend   prependComment.py --fix-aliases applying the found edits
+  pipeline  fixWarnings.py -a end to end (fake mix -> find -> fix)
+
+Results are written as JSON so runs from different commits can be compared:
+
+    benchWarnings.py -o before.json
+    git checkout other-branch
+    benchWarnings.py -o after.json
+    benchWarnings.py --compare before.json after.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# --- Configuration ---
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIND_WARNINGS_SCRIPT = os.path.join(SCRIPTS_DIR, "findWarningsByPrefix.py")
+PREPEND_COMMENT_SCRIPT = os.path.join(SCRIPTS_DIR, "prependComment.py")
+FIX_WARNINGS_SCRIPT = os.path.join(SCRIPTS_DIR, "fixWarnings.py")
+
+DEFAULT_COUNTS = [100, 1_000, 10_000, 100_000, 1_000_000]
+QUICK_COUNTS = [100, 1_000, 10_000]
+ALIASES_PER_FILE = 200
+REGRESSION_THRESHOLD = 0.10  # --compare flags slowdowns/growth above 10%
+# --- End Configuration ---
+
+# Category mix of the generated corpus (weights sum to 1.0).
+CATEGORY_WEIGHTS = [
+    ("unused_alias", 0.4),
+    ("undefined_private", 0.3),
+    ("unused_variable", 0.2),
+    ("deprecated", 0.1),
+]
+
+FAKE_MIX_SOURCE = """#!{python}
+# Fake `mix` for benchWarnings.py: replays a saved corpus as `mix compile` output.
+import shutil, sys
+with open({corpus!r}, "rb") as f:
+    shutil.copyfileobj(f, sys.stdout.buffer, 1024 * 1024)
+"""
+
+
+def file_location(rng, path, line):
+    """Returns one of the '└─' location variants emitted by different Elixir versions."""
+    col = rng.randint(1, 9)
+    variant = rng.random()
+    if variant < 0.25:
+        return f"{path}:{line}"
+    if variant < 0.5:
+        return f"{path}:{line}:{col}"
+    return f"{path}:{line}:{col}: MyApp.Bench (module)"
+
+
+def write_warning(out, message, line, source_line, location):
+    out.write(
+        f"    warning: {message}\n"
+        f"    │\n"
+        f"{line:>4} │ {source_line}\n"
+        f"    │   ~\n"
+        f"    │\n"
+        f"    └─ {location}\n\n"
+    )
+
+
+def generate_corpus(work_dir, count, seed):
+    """
+    Writes a synthetic source tree and a matching compile log of `count` warnings.
+
+    Unused-alias warnings point at real `alias` lines (each used once) so the
+    fixers have genuine edits to make; other categories point at arbitrary lines.
+
+    Returns:
+        dict: {"corpus": path, "tree": path, "alias_warnings": int, "bytes": int, "lines": int}
+    """
+    rng = random.Random(seed)
+    categories = [name for name, _ in CATEGORY_WEIGHTS]
+    weights = [weight for _, weight in CATEGORY_WEIGHTS]
+    picks = rng.choices(categories, weights, k=count)
+    alias_count = picks.count("unused_alias")
+
+    tree = os.path.join(work_dir, "project")
+    lib_dir = os.path.join(tree, "lib", "bench")
+    os.makedirs(lib_dir)
+    file_count = max(1, -(-alias_count // ALIASES_PER_FILE))
+    for file_index in range(file_count):
+        with open(os.path.join(lib_dir, f"file_{file_index}.ex"), "w", encoding="utf-8") as f:
+            f.write(f"defmodule MyApp.Bench{file_index} do\n")
+            for alias_index in range(ALIASES_PER_FILE):
+                f.write(f"  alias MyApp.Dep{alias_index}\n")
+            f.write("\n  def run(x), do: x\nend\n")
+
+    corpus = os.path.join(work_dir, "compile_output.txt")
+    next_alias = 0
+    line_count = 0
+    with open(corpus, "w", encoding="utf-8") as out:
+        out.write("Compiling 1 file (.ex)\n")
+        for category in picks:
+            file_index = rng.randrange(file_count)
+            path = f"lib/bench/file_{file_index}.ex"
+            line = rng.randint(2, ALIASES_PER_FILE + 1)
+            if category == "unused_alias":
+                file_index, alias_index = divmod(next_alias, ALIASES_PER_FILE)
+                next_alias += 1
+                path = f"lib/bench/file_{file_index}.ex"
+                line = alias_index + 2
+                write_warning(out, f"unused alias Dep{alias_index}", line,
+                              f"  alias MyApp.Dep{alias_index}", file_location(rng, path, line))
+            elif category == "undefined_private":
+                write_warning(out, f"MyApp.Missing{line}.call/{line % 4} is undefined or private", line,
+                              f"  MyApp.Missing{line}.call()", file_location(rng, path, line))
+            elif category == "unused_variable":
+                write_warning(out, 'variable "x" is unused (if the variable is not meant to be used, '
+                                   'prefix it with an underscore)', line, "  x = 1", file_location(rng, path, line))
+            else:
+                write_warning(out, f"MyApp.Old.fun{line}/0 is deprecated. Use MyApp.New.fun/0 instead", line,
+                              f"  MyApp.Old.fun{line}()", file_location(rng, path, line))
+            line_count += 7
+        out.write("Generated my_app app\n")
+
+    return {
+        "corpus": corpus,
+        "tree": tree,
+        "alias_warnings": alias_count,
+        "bytes": os.path.getsize(corpus),
+        "lines": line_count + 2,
+    }
+
+
+def install_fake_mix(work_dir, corpus):
+    """Creates a bin/ dir with a fake `mix` that prints `corpus`. Returns the bin dir."""
+    bin_dir = os.path.join(work_dir, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    mix_path = os.path.join(bin_dir, "mix")
+    with open(mix_path, "w", encoding="utf-8") as f:
+        f.write(FAKE_MIX_SOURCE.format(python=sys.executable, corpus=corpus))
+    os.chmod(mix_path, 0o755)
+    return bin_dir
+
+
+def run_measured(command, cwd=None, env=None, stdin_path=None, stdout_path=None):
+    """
+    Runs a command and measures wall time and peak RSS (KiB) via wait4().
+
+    Returns:
+        tuple: (seconds, peak_rss_kb, returncode)
+    """
+    stdin = open(stdin_path, "rb") if stdin_path else subprocess.DEVNULL
+    stdout = open(stdout_path, "wb") if stdout_path else subprocess.DEVNULL
+    try:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, env=env, stdin=stdin, stdout=stdout,
+                                   stderr=subprocess.DEVNULL)
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+    finally:
+        if stdin_path:
+            stdin.close()
+        if stdout_path:
+            stdout.close()
+    # ru_maxrss is KiB on Linux; it also covers descendants the child waited for.
+    return seconds, usage.ru_maxrss, process.returncode
+
+
+def bench_count(count, seed, keep_dir=None):
+    """Runs all benchmarks for one warning count. Returns a list of result dicts."""
+    if keep_dir is not None:
+        os.makedirs(keep_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=f"benchWarnings-{count}-", dir=keep_dir)
+    results = []
+    try:
+        gen_start = time.perf_counter()
+        corpus = generate_corpus(work_dir, count, seed)
+        print(f"[{count}] generated {corpus['bytes'] / 1e6:.1f} MB corpus, "
+              f"{corpus['alias_warnings']} alias warnings ({time.perf_counter() - gen_start:.1f}s)",
+              file=sys.stderr)
+
+        megabytes = corpus["bytes"] / 1e6
+        edits_json = os.path.join(work_dir, "edits.json")
+        seconds, rss, rc = run_measured([sys.executable, FIND_WARNINGS_SCRIPT, "--unused-alias", corpus["corpus"]],
+                                        stdout_path=edits_json)
+        results.append({
+            "bench": "parse", "warnings": count, "ok": rc == 0, "seconds": round(seconds, 4),
+            "lines_per_sec": round(corpus["lines"] / seconds), "mb_per_sec": round(megabytes / seconds, 2),
+            "peak_rss_kb": rss,
+        })
+
+        pristine = corpus["tree"] + ".pristine"
+        shutil.copytree(corpus["tree"], pristine)
+        seconds, rss, rc = run_measured([sys.executable, PREPEND_COMMENT_SCRIPT, "--fix-aliases", "--no-journal"],
+                                        cwd=corpus["tree"], stdin_path=edits_json)
+        results.append({
+            "bench": "prepend", "warnings": count, "ok": rc == 0, "seconds": round(seconds, 4),
+            "edits_per_sec": round(corpus["alias_warnings"] / seconds), "peak_rss_kb": rss,
+        })
+
+        # End to end on an untouched tree, with the fake mix first on PATH.
+        shutil.rmtree(corpus["tree"])
+        os.rename(pristine, corpus["tree"])
+        env = dict(os.environ)
+        env["PATH"] = install_fake_mix(work_dir, corpus["corpus"]) + os.pathsep + env.get("PATH", "")
+        env["FIX_WARNINGS_SCRIPTS_DIR"] = SCRIPTS_DIR
+        # Keeps the run's prependComment journal out of the user's real ~/.cache.
+        env["XDG_CACHE_HOME"] = os.path.join(work_dir, "cache")
+        seconds, rss, rc = run_measured([sys.executable, FIX_WARNINGS_SCRIPT, "-a"], cwd=corpus["tree"], env=env)
+        results.append({
+            "bench": "pipeline", "warnings": count, "ok": rc == 0, "seconds": round(seconds, 4),
+            "warnings_per_sec": round(count / seconds), "peak_rss_kb": rss,
+        })
+    finally:
+        if keep_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    for result in results:
+        status = "" if result["ok"] else "  (FAILED)"
+        print(f"[{count}] {result['bench']:<8} {result['seconds']:>9.3f}s  {result['peak_rss_kb'] / 1024:>8.1f} MiB{status}",
+              file=sys.stderr)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(old_path, new_path):
+    """Prints per-benchmark time and RSS ratios between two result files. Returns an exit code."""
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    old_by_key = {(r["bench"], r["warnings"]): r for r in old["results"]}
+    regressions = 0
+    print(f"{'BENCH':<9} {'WARNINGS':>9} {'OLD s':>9} {'NEW s':>9} {'TIME':>7} {'OLD MiB':>8} {'NEW MiB':>8} {'RSS':>7}")
+    for r in new["results"]:
+        o = old_by_key.get((r["bench"], r["warnings"]))
+        if o is None:
+            continue
+        time_ratio = r["seconds"] / o["seconds"] if o["seconds"] else 1.0
+        rss_ratio = r["peak_rss_kb"] / o["peak_rss_kb"] if o["peak_rss_kb"] else 1.0
+        flag = ""
+        if time_ratio > 1 + REGRESSION_THRESHOLD or rss_ratio > 1 + REGRESSION_THRESHOLD:
+            flag = "  <-- regression"
+            regressions += 1
+        print(f"{r['bench']:<9} {r['warnings']:>9} {o['seconds']:>9.3f} {r['seconds']:>9.3f} {time_ratio:>6.2f}x "
+              f"{o['peak_rss_kb'] / 1024:>8.1f} {r['peak_rss_kb'] / 1024:>8.1f} {rss_ratio:>6.2f}x{flag}")
+    print(f"\n{old.get('meta', {}).get('revision')} -> {new.get('meta', {}).get('revision')}: "
+          f"{regressions} regression(s) above {REGRESSION_THRESHOLD:.0%}.")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmarks findWarningsByPrefix.py, prependComment.py and fixWarnings.py "
+                    "against synthetic Elixir warning corpora (runs fully offline).",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--counts",
+        help="Comma-separated warning counts. Defaults to "
+             f"{','.join(str(c) for c in DEFAULT_COUNTS)}."
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help=f"Shortcut for --counts {','.join(str(c) for c in QUICK_COUNTS)}."
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1,
+        help="Random seed for corpus generation (same seed -> same corpus)."
+    )
+    parser.add_argument(
+        "-o", "--output",
+        metavar="PATH",
+        help="Write JSON results here instead of stdout."
+    )
+    parser.add_argument(
+        "--keep",
+        metavar="DIR",
+        help="Generate corpora under DIR and keep them for inspection."
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD_JSON", "NEW_JSON"),
+        help="Compare two result files instead of running benchmarks."
+    )
+
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare_results(*args.compare))
+
+    if args.quick:
+        counts = QUICK_COUNTS
+    elif args.counts:
+        try:
+            counts = [int(c) for c in args.counts.split(",") if c.strip()]
+        except ValueError:
+            parser.error("--counts must be a comma-separated list of integers")
+    else:
+        counts = DEFAULT_COUNTS
+
+    results = []
+    for count in counts:
+        results.extend(bench_count(count, args.seed, args.keep))
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to '{args.output}'", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
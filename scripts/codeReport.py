@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+import argparse
+import heapq
+import json
+import os
+import re
+import sys
+
+from fileWalk import walk_tree, TreeSizes
+from ignoreMatch import IgnoreMatcher
+
+# --- Configuration ---
+DEFAULT_EXTENSIONS = [".ex", ".exs", ".heex", ".py"]
+DEFAULT_TOP_N = 20
+SORT_KEYS = ["lines", "bytes", "code", "comments", "largest_function"]
+# --- End Configuration ---
+
+# Line comment prefixes per extension. .heex uses block comments (handled below).
+LINE_COMMENT_PREFIXES = {
+    ".ex": "#",
+    ".exs": "#",
+    ".py": "#",
+}
+
+# HEEx block comments: "<%!-- ... --%>" and plain HTML "<!-- ... -->".
+HEEX_COMMENT_BLOCKS = [("<%!--", "--%>"), ("<!--", "-->")]
+
+# Function heuristics. The indentation group lets us find where a function ends.
+#   e.g. "  defp build_config(opts) do" -> indent "  ", name "build_config"
+ELIXIR_FUNCTION_PATTERN = re.compile(r"^(\s*)(?:def|defp|defmacro|defmacrop)\s+([a-z_][\w?!]*)")
+PYTHON_FUNCTION_PATTERN = re.compile(r"^(\s*)(?:async\s+)?def\s+([A-Za-z_]\w*)")
+FUNCTION_PATTERNS = {
+    ".ex": ELIXIR_FUNCTION_PATTERN,
+    ".exs": ELIXIR_FUNCTION_PATTERN,
+    ".py": PYTHON_FUNCTION_PATTERN,
+}
+
+
+def parse_extensions(values):
+    """Normalizes repeated/comma-separated --ext values into a list like ['.ex', '.py']."""
+    extensions = []
+    for value in values:
+        for ext in value.split(","):
+            ext = ext.strip()
+            if not ext:
+                continue
+            if not ext.startswith("."):
+                ext = "." + ext
+            if ext not in extensions:
+                extensions.append(ext)
+    return extensions
+
+
+def measure_file(path, ext):
+    """
+    Computes all metrics for one file in a single read and a single pass over its lines.
+
+    Args:
+        path (str): The file to measure.
+        ext (str): Its extension, used to choose comment and function heuristics.
+
+    Returns:
+        dict: Metrics for the file, or None if it could not be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        print(f"Warning: Cannot read '{path}': {e}. Skipping.", file=sys.stderr)
+        return None
+
+    comment_prefix = LINE_COMMENT_PREFIXES.get(ext)
+    function_pattern = FUNCTION_PATTERNS.get(ext)
+    is_elixir = ext in (".ex", ".exs")
+    is_heex = ext == ".heex"
+
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    blank = 0
+    comments = 0
+    heex_block_end = None
+
+    largest_name = None
+    largest_length = 0
+    open_function = None  # (name, indent_len, start_index)
+
+    def close_function(end_index):
+        nonlocal largest_name, largest_length, open_function
+        name, _, start_index = open_function
+        length = end_index - start_index + 1
+        if length > largest_length:
+            largest_name, largest_length = name, length
+        open_function = None
+
+    last_code_index = -1
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            blank += 1
+            continue
+
+        if is_heex:
+            if heex_block_end is not None:
+                comments += 1
+                if heex_block_end in stripped:
+                    heex_block_end = None
+                continue
+            for start, end in HEEX_COMMENT_BLOCKS:
+                if stripped.startswith(start):
+                    comments += 1
+                    if end not in stripped[len(start):]:
+                        heex_block_end = end
+                    break
+            continue
+
+        if comment_prefix and stripped.startswith(comment_prefix):
+            comments += 1
+            continue
+
+        if function_pattern is None:
+            continue
+
+        indent_len = len(line) - len(line.lstrip())
+        if open_function is not None:
+            open_indent = open_function[1]
+            if is_elixir and indent_len == open_indent and (stripped == "end" or stripped.startswith("end ")):
+                close_function(index)
+                last_code_index = index
+                continue
+            if indent_len < open_indent or (indent_len == open_indent and not is_elixir):
+                close_function(last_code_index)
+
+        match = function_pattern.match(line)
+        if match:
+            if open_function is not None and len(match.group(1)) <= open_function[1]:
+                close_function(last_code_index)
+            if open_function is None:
+                open_function = (match.group(2), len(match.group(1)), index)
+        last_code_index = index
+
+    if open_function is not None:
+        close_function(last_code_index)
+
+    total = len(lines)
+    return {
+        "path": path,
+        "ext": ext,
+        "lines": total,
+        "bytes": len(data),
+        "blank": blank,
+        "comments": comments,
+        "code": total - blank - comments,
+        "blank_ratio": round(blank / total, 3) if total else 0.0,
+        "comment_ratio": round(comments / total, 3) if total else 0.0,
+        "largest_function": largest_name,
+        "largest_function_lines": largest_length,
+    }
+
+
+def sort_value(metrics, sort_key):
+    if sort_key == "largest_function":
+        return metrics["largest_function_lines"]
+    return metrics[sort_key]
+
+
+def build_report(root, extensions, top_n, sort_key, min_lines=0, tree_sizes=None, matcher=None):
+    """
+    Walks `root` once, measuring every file with a matching extension.
+
+    Only the top-N files are kept, using a bounded min-heap rather than sorting
+    every file. If `tree_sizes` (a fileWalk.TreeSizes) is given, per-directory
+    byte totals for all files are collected from the same walk. If `matcher`
+    (an ignoreMatch.IgnoreMatcher) is given, ignored directories are pruned.
+
+    Returns:
+        dict: {"top": [...], "totals": {ext: {...}}, "files_scanned": int}
+    """
+    heap = []
+    totals = {ext: {"files": 0, "lines": 0, "bytes": 0, "blank": 0, "comments": 0} for ext in extensions}
+    files_scanned = 0
+    sequence = 0  # Tie-breaker so the heap never compares dicts.
+
+    for dir_path, _, files in walk_tree(root, matcher):
+        for entry in files:
+            ext = os.path.splitext(entry.name)[1]
+            if tree_sizes is not None:
+                try:
+                    tree_sizes.add(dir_path, entry.name, entry.stat(follow_symlinks=False).st_size)
+                except OSError:
+                    pass
+            if ext not in totals:
+                continue
+
+            metrics = measure_file(entry.path, ext)
+            if metrics is None:
+                continue
+            files_scanned += 1
+            ext_totals = totals[ext]
+            ext_totals["files"] += 1
+            for key in ("lines", "bytes", "blank", "comments"):
+                ext_totals[key] += metrics[key]
+
+            if metrics["lines"] < min_lines:
+                continue
+            item = (sort_value(metrics, sort_key), sequence, metrics)
+            sequence += 1
+            if len(heap) < top_n:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    top = [metrics for _, _, metrics in sorted(heap, key=lambda item: (-item[0], item[1]))]
+    return {"top": top, "totals": totals, "files_scanned": files_scanned}
+
+
+def print_text_report(report, sort_key):
+    print(f"{'LINES':>7} {'BYTES':>9} {'BLANK%':>7} {'CMT%':>6} {'LARGEST FN':>10}  PATH")
+    print("-" * 79)
+    for m in report["top"]:
+        function = f"{m['largest_function_lines']}" if m["largest_function"] else "-"
+        print(f"{m['lines']:>7} {m['bytes']:>9} {m['blank_ratio'] * 100:>6.1f}% "
+              f"{m['comment_ratio'] * 100:>5.1f}% {function:>10}  {m['path']}"
+              + (f" ({m['largest_function']})" if m["largest_function"] else ""))
+    print("-" * 79)
+    for ext, t in report["totals"].items():
+        if t["files"]:
+            print(f"{ext:<6} {t['files']:>6} files {t['lines']:>9} lines {t['bytes']:>11} bytes")
+    print(f"Scanned {report['files_scanned']} files, top {len(report['top'])} by {sort_key}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reports the largest source files in a tree with line, byte, blank, comment "
+                    "and largest-function metrics, computed in a single pass per file.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "root",
+        nargs="?",
+        default=".",
+        help="Directory to scan. Defaults to the current directory."
+    )
+    parser.add_argument(
+        "--ext",
+        action="append",
+        metavar="EXT",
+        help="Extension(s) to include, repeatable or comma-separated (e.g. --ext .ex,.exs).\n"
+             f"Defaults to {','.join(DEFAULT_EXTENSIONS)}."
+    )
+    parser.add_argument(
+        "-n", "--top",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help=f"Number of files to report. Defaults to {DEFAULT_TOP_N}."
+    )
+    parser.add_argument(
+        "--sort",
+        choices=SORT_KEYS,
+        default="lines",
+        help="Metric used to rank files. Defaults to 'lines'."
+    )
+    parser.add_argument(
+        "--min-lines",
+        type=int,
+        default=0,
+        help="Only rank files with at least this many lines."
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Emit the report as JSON (for dashboards) instead of a table."
+    )
+    parser.add_argument(
+        "--tree-sizes",
+        action="store_true",
+        help="Also collect per-directory byte totals by extension from the same walk\n"
+             "(included in --json output as 'tree')."
+    )
+    parser.add_argument(
+        "--no-ignore",
+        action="store_true",
+        help="Also descend into .gitignore'd and default-ignored directories\n"
+             "(deps/, _build/, node_modules/, .git, ...)."
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"Error: '{args.root}' is not a valid directory.", file=sys.stderr)
+        sys.exit(1)
+    if args.top < 1:
+        parser.error("--top must be >= 1")
+
+    extensions = parse_extensions(args.ext) if args.ext else list(DEFAULT_EXTENSIONS)
+    tree_sizes = TreeSizes() if args.tree_sizes else None
+    matcher = None if args.no_ignore else IgnoreMatcher(args.root)
+
+    report = build_report(args.root, extensions, args.top, args.sort, args.min_lines, tree_sizes, matcher)
+
+    if args.json:
+        output = {
+            "root": os.path.abspath(args.root),
+            "extensions": extensions,
+            "sort": args.sort,
+            **report,
+        }
+        if tree_sizes is not None:
+            output["tree"] = tree_sizes.to_dict()
+        print(json.dumps(output, indent=2))
+    else:
+        print_text_report(report, args.sort)
+        if tree_sizes is not None:
+            print()
+            for dir_path, totals in sorted(tree_sizes.to_dict().items()):
+                summary = ", ".join(f"{size}B {ext}" for ext, size in totals.items())
+                print(f"{dir_path} ({summary})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+"""
+Local stand-in for the Gemini API, for exercising llm.py / llmScheduler.py
+retry, rate-limit and resume handling without a network or an API key.
+
+It answers `models/*:streamGenerateContent` (SSE) and `models/*:generateContent`
+with a deterministic reply ("word0 word1 ... wordN-1"), and injects faults:
+
+    fakeGeminiServer.py --port 8765 --fail 429,503 --cut-after 3
+    GEMINI_API_KEY=fake llm.py --base-url http://127.0.0.1:8765 --stats hello
+
+--fail CODES    fail the first requests with these HTTP codes, in order
+--fail-rate P   additionally fail any request with probability P (--fail-code)
+--cut-after N   drop the connection after N chunks of the first stream
+                (every stream with --cut-always)
+
+A request that carries a model turn (a resumed stream) is answered with the
+rest of the reply after the words the model turn already contains, so the
+client's final output can be checked against the full reply exactly. With
+--resume-overlap N the answer starts N words early, like a model repeating
+itself, which the client has to trim.
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Configuration ---
+DEFAULT_PORT = 8765
+DEFAULT_WORDS = 40
+WORDS_PER_CHUNK = 4
+# --- End Configuration ---
+
+STATUS_NAMES = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 502: "UNAVAILABLE", 503: "UNAVAILABLE",
+                504: "DEADLINE_EXCEEDED", 400: "INVALID_ARGUMENT", 403: "PERMISSION_DENIED"}
+
+
+def full_reply(word_count):
+    return " ".join(f"word{i}" for i in range(word_count))
+
+
+class FaultPlan:
+    """Decides, thread-safely, which requests fail and which streams are cut."""
+
+    def __init__(self, fail_codes, fail_rate, fail_code, cut_after, cut_always, seed):
+        self._lock = threading.Lock()
+        self._fail_codes = list(fail_codes)
+        self._fail_rate = fail_rate
+        self._fail_code = fail_code
+        self._cut_after = cut_after
+        self._cut_always = cut_always
+        self._rng = random.Random(seed)
+        self.requests = 0
+
+    def next_request(self):
+        """Returns (error_code_or_None, cut_after_chunks_or_None) for the next request."""
+        with self._lock:
+            self.requests += 1
+            if self._fail_codes:
+                return self._fail_codes.pop(0), None
+            if self._fail_rate and self._rng.random() < self._fail_rate:
+                return self._fail_code, None
+            cut = self._cut_after
+            if not self._cut_always:
+                self._cut_after = None
+            return None, cut
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        print(f"fakeGeminiServer: {self.address_string()} {fmt % args}", file=sys.stderr)
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code):
+        error = {"code": code, "message": f"Injected error {code}", "status": STATUS_NAMES.get(code, "UNKNOWN")}
+        if code == 429 and self.server.retry_delay is not None:
+            error["details"] = [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                                 "retryDelay": f"{self.server.retry_delay}s"}]
+        self._send_json(code, {"error": error})
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"code": 400, "message": "Bad JSON", "status": "INVALID_ARGUMENT"}})
+            return
+        if ":streamGenerateContent" not in self.path and ":generateContent" not in self.path:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+            return
+
+        error_code, cut_after = self.server.faults.next_request()
+        if error_code:
+            self._send_error(error_code)
+            return
+
+        # A model turn means the client is resuming a cut stream: skip what it already has.
+        words = full_reply(self.server.word_count).split(" ")
+        already = 0
+        for content in request.get("contents", []):
+            if content.get("role") == "model":
+                text = "".join(part.get("text", "") for part in content.get("parts", []))
+                already = len(text.split())
+        if already:
+            already = max(0, already - self.server.resume_overlap)
+        remaining = words[already:]
+        pieces = []
+        for start in range(0, len(remaining), WORDS_PER_CHUNK):
+            piece = " ".join(remaining[start:start + WORDS_PER_CHUNK])
+            pieces.append((" " if start or already else "") + piece)
+
+        if ":generateContent" in self.path:
+            self._send_json(200, self._response("".join(pieces), final=True))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, piece in enumerate(pieces):
+            if cut_after is not None and index >= cut_after:
+                # Drop the connection without the terminating chunk, like a reset mid-stream.
+                self.close_connection = True
+                self.wfile.flush()
+                self.connection.close()
+                return
+            event = f"data: {json.dumps(self._response(piece, final=index == len(pieces) - 1))}\r\n\r\n"
+            self._write_chunk(event.encode("utf-8"))
+        self._write_chunk(b"")
+
+    @staticmethod
+    def _response(text, final):
+        candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+        if final:
+            candidate["finishReason"] = "STOP"
+        return {"candidates": [candidate]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Gemini API server with error injection.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (0 = any free port). Defaults to {DEFAULT_PORT}.")
+    parser.add_argument("--words", type=int, default=DEFAULT_WORDS, help=f"Words in the reply. Defaults to {DEFAULT_WORDS}.")
+    parser.add_argument("--fail", default="", help="Comma-separated HTTP codes to fail the first requests with, e.g. 429,503.")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Probability of failing any further request.")
+    parser.add_argument("--fail-code", type=int, default=503, help="Code for --fail-rate failures. Defaults to 503.")
+    parser.add_argument("--cut-after", type=int, help="Drop the first stream's connection after this many chunks.")
+    parser.add_argument("--cut-always", action="store_true", help="Apply --cut-after to every stream.")
+    parser.add_argument("--retry-delay", type=float, help="Advertise this RetryInfo delay (seconds) on 429s.")
+    parser.add_argument("--resume-overlap", type=int, default=0,
+                        help="Repeat this many already-sent words at the start of a resumed stream.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --fail-rate.")
+    args = parser.parse_args()
+
+    fail_codes = [int(code) for code in args.fail.split(",") if code.strip()]
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    server.daemon_threads = True
+    server.faults = FaultPlan(fail_codes, args.fail_rate, args.fail_code, args.cut_after, args.cut_always, args.seed)
+    server.word_count = args.words
+    server.retry_delay = args.retry_delay
+    server.resume_overlap = args.resume_overlap
+    print(f"fakeGeminiServer: listening on http://127.0.0.1:{server.server_address[1]}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""
+Shared directory walker for the size and report scripts (codeReport.py, treeSize.sh).
+
+A single os.scandir() pass yields the DirEntry objects for every directory, so
+callers can collect per-file metrics and per-directory size totals from the same
+walk instead of scanning a repository twice. With an ignoreMatch.IgnoreMatcher,
+ignored directories (deps/, _build/, node_modules/, .gitignore entries) are pruned
+before they are descended into.
+
+Shell scripts use it through the CLI:
+    fileWalk.py ROOT --list-files [--ext .ex] [-0]   # one path per file
+    fileWalk.py ROOT --tree-sizes                   # "D<TAB>dir" / "S<TAB>dir<TAB>ext<TAB>bytes"
+"""
+
+import argparse
+import os
+import sys
+
+from ignoreMatch import IgnoreMatcher
+
+
+def walk_tree(root, matcher=None):
+    """
+    Walks `root` top-down, yielding (dir_path, subdir_entries, file_entries).
+
+    Like os.walk(), the caller may remove items from `subdir_entries` in place
+    to prune them before they are descended into. Symlinked directories are not
+    followed. Unreadable directories are reported to stderr and skipped.
+
+    Args:
+        root (str): Directory to walk.
+        matcher (IgnoreMatcher, optional): Drops ignored files and prunes ignored
+                                           directories before they are yielded.
+    """
+    stack = [root]
+    while stack:
+        dir_path = stack.pop()
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append(entry)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Warning: Cannot read directory '{dir_path}': {e}. Skipping.", file=sys.stderr)
+            continue
+
+        if matcher is not None:
+            subdirs, files = matcher.filter_entries(dir_path, subdirs, files)
+        subdirs.sort(key=lambda e: e.name)
+        files.sort(key=lambda e: e.name)
+        yield dir_path, subdirs, files
+
+        # Reversed so that the stack pops subdirectories in sorted order.
+        stack.extend(entry.path for entry in reversed(subdirs))
+
+
+def file_extension(name):
+    """Returns the extension of `name` (e.g. '.ex'), or '.<no_ext>' like treeSize.sh does."""
+    ext = os.path.splitext(name)[1]
+    return ext if ext else ".<no_ext>"
+
+
+class TreeSizes:
+    """Accumulates byte totals per directory and extension during a walk."""
+
+    def __init__(self):
+        self.by_dir = {}
+
+    def add(self, dir_path, name, size):
+        totals = self.by_dir.setdefault(dir_path, {})
+        ext = file_extension(name)
+        totals[ext] = totals.get(ext, 0) + size
+
+    def to_dict(self):
+        """Returns {dir_path: {ext: bytes}} with extensions sorted like treeSize.sh output."""
+        return {
+            dir_path: dict(sorted(totals.items()))
+            for dir_path, totals in self.by_dir.items()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Walks a directory tree once, pruning ignored directories, and prints "
+                    "either the file list or per-directory size totals for shell scripts.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("root", help="Directory to walk.")
+    mode_group = parser.add_mutually_exclusive_group(required=True)
+    mode_group.add_argument(
+        "--list-files",
+        action="store_true",
+        help="Print the path of every non-ignored file."
+    )
+    mode_group.add_argument(
+        "--tree-sizes",
+        action="store_true",
+        help="Print 'D<TAB>dir' for every directory, followed by\n"
+             "'S<TAB>dir<TAB>ext<TAB>bytes' totals for the files directly inside it."
+    )
+    parser.add_argument(
+        "--ext",
+        action="append",
+        metavar="EXT",
+        help="With --list-files, only list files with this extension (repeatable)."
+    )
+    parser.add_argument(
+        "-0", "--null",
+        action="store_true",
+        help="Separate records with NUL instead of newline (for xargs -0 / read -d '')."
+    )
+    parser.add_argument(
+        "--no-ignore",
+        action="store_true",
+        help="Do not prune .gitignore entries or the default ignore set."
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.root):
+        print(f"Error: '{args.root}' is not a valid directory.", file=sys.stderr)
+        sys.exit(1)
+
+    matcher = None if args.no_ignore else IgnoreMatcher(args.root)
+    extensions = tuple(args.ext) if args.ext else None
+    end = "\0" if args.null else "\n"
+    out = sys.stdout
+
+    for dir_path, _, files in walk_tree(args.root, matcher):
+        if args.list_files:
+            for entry in files:
+                if extensions is None or entry.name.endswith(extensions):
+                    out.write(entry.path + end)
+            continue
+
+        out.write(f"D\t{dir_path}{end}")
+        sizes = TreeSizes()
+        for entry in files:
+            try:
+                sizes.add(dir_path, entry.name, entry.stat(follow_symlinks=False).st_size)
+            except OSError:
+                continue
+        for ext, size in sizes.to_dict().get(dir_path, {}).items():
+            out.write(f"S\t{dir_path}\t{ext}\t{size}{end}")
+
+
+if __name__ == "__main__":
+    main()
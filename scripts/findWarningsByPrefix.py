@@ -3,9 +3,12 @@
 import re
 import sys
 import argparse
+import itertools
 import json
 import os
 
+import instrument
+
 # --- Debugging Configuration ---
 ENABLE_DEBUG_PRINTING = False
 # --- End Debugging Configuration ---
@@ -25,6 +28,43 @@ line_number_pattern = re.compile(r"^\s*(\d+)\s*│")
 #file_path_pattern = re.compile(r"^\s*└─ (.*?):\d+:\d+:")
 file_path_pattern = re.compile(r"^\s*└─ (.*?):\d+(?::\d+)?")
 
+# Used by iter_warnings(), which collects every warning regardless of type.
+#   e.g. "    warning: unused alias Repo" -> "unused alias Repo"
+any_warning_pattern = re.compile(r"^\s*warning: (.*)$")
+#   e.g. "    └─ lib/foo.ex:12:3: MyApp.Foo.bar/2" -> path, line, column, context
+location_pattern = re.compile(r"^\s*└─ (.*?):(\d+)(?::(\d+))?(?::\s*(.*))?$")
+
+def iter_warnings(lines_iterator):
+    """
+    Yields every warning in compiler output as a dict:
+        {"message", "fileWithPath", "lineNumber", "column", "context"}
+
+    Unlike process_lines(), this does not filter by warning type and takes the
+    line number from the '└─ path:line:col' location, so one pass over a log
+    can feed an index (warningIndex.py) or a live warning map (watchWarnings.py).
+    A warning without a location before the next warning is dropped.
+    """
+    message = None
+    for line_raw in lines_iterator:
+        line = line_raw.rstrip('\n')
+        match_warning = any_warning_pattern.match(line)
+        if match_warning:
+            message = match_warning.group(1).strip()
+            continue
+        if message is None:
+            continue
+        match_location = location_pattern.match(line)
+        if match_location:
+            file_path, line_number, column, context = match_location.groups()
+            yield {
+                "message": message,
+                "fileWithPath": file_path,
+                "lineNumber": int(line_number),
+                "column": int(column) if column else None,
+                "context": context.strip() if context else None,
+            }
+            message = None
+
 def process_lines(lines_iterator, warning_pattern):
     """
     Processes lines from an iterator, identifies warning sequences based on the
@@ -51,7 +91,9 @@ def process_lines(lines_iterator, warning_pattern):
                 dprint(f"    SUCCESS: Matched file path: '{file_path}'")
                 results.append({
                     "lineNumber": current_line_number,
-                    "fileWithPath": file_path
+                    "fileWithPath": file_path,
+                    # Lets fixers act on the message (e.g. which alias is unused).
+                    "warning": active_warning_line_content.strip()
                 })
                 dprint(f"    Recorded: {{LNo: {current_line_number}, Path: '{file_path}'}}")
                 state = "SEEK_WARNING"
@@ -101,10 +143,151 @@ def process_lines(lines_iterator, warning_pattern):
 
     return results
 
+# --- Parser backends for other compilers/linters ---
+# Each format is precompiled once. Single-line formats (ruff, tsc) are one
+# regex per line; rustc puts the message and its '-->' location on separate
+# lines. All patterns use the named groups path/line/message (col optional).
+# Elixir output keeps its own state machine in process_lines() above.
+ANSI_ESCAPE_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+SNIFF_LINE_LIMIT = 1000
+
+class Backend:
+    """One compiler output format: how to recognize it and where the path, line and message are."""
+
+    def __init__(self, name, sniff, line_patterns=(), header_pattern=None, location_pattern=None):
+        self.name = name
+        self.sniff = sniff
+        self.line_patterns = line_patterns
+        self.header_pattern = header_pattern
+        self.location_pattern = location_pattern
+
+    def parse(self, lines_iterator, message_filter=None):
+        """
+        Yields {"lineNumber", "fileWithPath", "warning"} for each diagnostic
+        whose message matches `message_filter` (a compiled regex, or None for all).
+        """
+        message = None
+        for line_raw in lines_iterator:
+            line = line_raw.rstrip('\n')
+            if "\x1b" in line:
+                line = ANSI_ESCAPE_PATTERN.sub("", line)
+            if self.header_pattern is not None:
+                match_header = self.header_pattern.match(line)
+                if match_header:
+                    message = match_header.group("message")
+                    continue
+                if message is None:
+                    continue
+                match = self.location_pattern.match(line)
+                if not match:
+                    continue
+                found_message = message
+                message = None
+            else:
+                for pattern in self.line_patterns:
+                    match = pattern.match(line)
+                    if match:
+                        break
+                else:
+                    continue
+                found_message = match.group("message")
+            if message_filter is not None and not message_filter.search(found_message):
+                continue
+            yield {
+                "lineNumber": match.group("line"),
+                "fileWithPath": match.group("path"),
+                "warning": found_message.strip()
+            }
+
+BACKENDS = {
+    # process_lines() does the parsing; the backend entry is only used for sniffing.
+    #   "    └─ lib/foo.ex:12:3: MyApp.Foo.bar/2"
+    "elixir": Backend("elixir", re.compile(r"^\s*└─ \S+:\d+")),
+    #   "warning: unused variable: `x`" / "error[E0425]: ..." then "  --> src/main.rs:2:9"
+    "rust": Backend(
+        "rust",
+        re.compile(r"^\s*--> \S+:\d+:\d+"),
+        header_pattern=re.compile(r"^(?P<message>(?:warning|error)(?:\[\w+\])?: .*)$"),
+        location_pattern=re.compile(r"^\s*--> (?P<path>.+?):(?P<line>\d+):(?P<col>\d+)\s*$"),
+    ),
+    #   "src/a.ts(12,5): error TS2304: Cannot find name 'x'."
+    #   "src/a.ts:12:5 - error TS6133: 'y' is declared but its value is never read."
+    "tsc": Backend(
+        "tsc",
+        re.compile(r"(?:\(\d+,\d+\): | - )(?:error|warning) TS\d+:"),
+        line_patterns=(
+            re.compile(r"^(?P<path>[^\s(][^(]*)\((?P<line>\d+),(?P<col>\d+)\): (?P<message>(?:error|warning) TS\d+:.*)$"),
+            re.compile(r"^(?P<path>[^\s:][^:]*):(?P<line>\d+):(?P<col>\d+) - (?P<message>(?:error|warning) TS\d+:.*)$"),
+        ),
+    ),
+    #   ruff / flake8: "app/x.py:3:8: F401 [*] `os` imported but unused"
+    #   pyflakes:      "app/x.py:3:1: 'os' imported but unused" (or without the column)
+    "ruff": Backend(
+        "ruff",
+        re.compile(r"^[^\s:][^:]*:\d+:(?:\d+:)? \S"),
+        line_patterns=(
+            re.compile(r"^(?P<path>[^\s:][^:]*):(?P<line>\d+):(?:(?P<col>\d+):)? (?P<message>\S.*)$"),
+        ),
+    ),
+}
+# A mix log can open with Erlang/C dependency diagnostics that look like other
+# tools' output ('src/x.erl:12:5: Warning: ...'), so any Elixir warning in the
+# sniffed lines wins; otherwise the most specific marker decides (a ruff-style
+# 'path:line:col: ' line can also appear in other tools' output).
+ELIXIR_WARNING_SNIFF = re.compile(r"^\s*warning: ")
+SNIFF_ORDER = ["rust", "tsc", "ruff"]
+
+def sniff_format(lines_iterator, default="elixir"):
+    """
+    Guesses the output format from its first SNIFF_LINE_LIMIT lines.
+
+    Elixir if a '└─' location appears, or a 'warning:' line without rustc's
+    '-->' locations; else the first of SNIFF_ORDER seen; else `default`.
+
+    Returns:
+        tuple: (format_name, lines_iterator) where the returned iterator still
+               yields the lines consumed while sniffing.
+    """
+    lines_iterator = iter(lines_iterator)
+    buffered = []
+    seen = set()
+    warning_line_seen = False
+    found = None
+    for line in itertools.islice(lines_iterator, SNIFF_LINE_LIMIT):
+        buffered.append(line)
+        if "\x1b" in line:
+            line = ANSI_ESCAPE_PATTERN.sub("", line)
+        if BACKENDS["elixir"].sniff.search(line):
+            found = "elixir"
+            break
+        if ELIXIR_WARNING_SNIFF.match(line):
+            warning_line_seen = True
+        for name in SNIFF_ORDER:
+            if name not in seen and BACKENDS[name].sniff.search(line):
+                seen.add(name)
+    if found is None:
+        if "rust" in seen:
+            found = "rust"
+        elif warning_line_seen:
+            found = "elixir"
+        else:
+            found = next((name for name in SNIFF_ORDER if name in seen), default)
+    dprint(f"Sniffed format: {found} (after {len(buffered)} lines)")
+    return found, itertools.chain(buffered, lines_iterator)
+
+def parse_lines(lines_iterator, output_format, elixir_warning_pattern, message_filter):
+    """Runs the backend for `output_format` ('auto' sniffs it). Returns (format_name, results)."""
+    if output_format == "auto":
+        output_format, lines_iterator = sniff_format(lines_iterator)
+    if output_format == "elixir":
+        return output_format, process_lines(lines_iterator, elixir_warning_pattern)
+    return output_format, list(BACKENDS[output_format].parse(lines_iterator, message_filter))
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Finds Elixir compiler warnings based on a specified prefix, "
-                    "extracts their line numbers and file paths, and outputs JSON.",
+        description="Finds compiler warnings based on a specified prefix, "
+                    "extracts their line numbers and file paths, and outputs JSON. "
+                    "Understands Elixir (mix compile), ruff/pyflakes/flake8, tsc and rustc/cargo output.",
         formatter_class=argparse.RawTextHelpFormatter
     )
 
@@ -120,8 +303,22 @@ def main():
         action="store_true",
         help="Search for 'unused alias ...' warnings."
     )
+    warning_type_group.add_argument(
+        "--match",
+        metavar="REGEX",
+        help="Search for warnings whose message matches REGEX (any format),\n"
+             "e.g. 'F401' (ruff), 'TS6133' (tsc), 'unused import' (rustc)."
+    )
     # Add more warning types here if needed in the future by adding to this group
 
+    parser.add_argument(
+        "--format",
+        choices=["auto"] + sorted(BACKENDS),
+        default="auto",
+        help="Compiler output format. 'auto' (default) sniffs the first lines;\n"
+             "--undefined-private and --unused-alias always mean 'elixir'."
+    )
+
     parser.add_argument(
         "-c", "--text-input",
         metavar="TEXT",
@@ -137,8 +334,10 @@ def main():
         action="store_true",
         help="Force enable debug prints to stderr for this run."
     )
+    instrument.add_arguments(parser)
 
     args = parser.parse_args()
+    instr = instrument.activate("findWarningsByPrefix", args)
 
     if args.debug_output:
         global ENABLE_DEBUG_PRINTING
@@ -155,6 +354,14 @@ def main():
         # Must start with "warning: unused alias "
         current_warning_pattern = re.compile(r"^\s*warning: unused alias ")
         dprint("Selected pattern: unused_alias")
+    elif args.match is not None:
+        try:
+            message_filter = re.compile(args.match)
+            # For Elixir output the regex applies to the text after "warning: ".
+            current_warning_pattern = re.compile(rf"^\s*warning: .*?(?:{args.match})")
+        except re.error as e:
+            parser.error(f"Invalid --match regex '{args.match}': {e}")
+        dprint(f"Selected pattern: --match {args.match!r}")
     # Add more elif conditions here if new flags are added
 
     # This should not happen due to `required=True` on the group, but good for safety
@@ -162,6 +369,13 @@ def main():
         parser.error("A warning type flag (e.g., --undefined-private or --unused-alias) must be specified.")
 
 
+    if args.match is None:
+        message_filter = None
+        if args.format not in ("auto", "elixir"):
+            parser.error("--undefined-private and --unused-alias only apply to Elixir output; use --match.")
+        # Never sniffed: a mix log may open with dependency output in another format.
+        args.format = "elixir"
+
     lines_iterator = None
     input_source_description = ""
 
@@ -193,13 +407,16 @@ def main():
 
     output_data = []
     if lines_iterator:
-        output_data = process_lines(lines_iterator, current_warning_pattern)
+        with instr.phase("parse"):
+            _, output_data = parse_lines(instrument.counting_lines(lines_iterator), args.format,
+                                         current_warning_pattern, message_filter)
     else:
         file_to_read = args.input_file if args.input_file else "WARNINGS.md"
         try:
             dprint(f"Attempting to open and read file: {file_to_read}")
-            with open(file_to_read, 'r', encoding='utf-8') as f:
-                output_data = process_lines(f, current_warning_pattern)
+            with open(file_to_read, 'r', encoding='utf-8') as f, instr.phase("parse"):
+                _, output_data = parse_lines(instrument.counting_lines(f), args.format,
+                                             current_warning_pattern, message_filter)
         except FileNotFoundError:
             print(f"Error: Input {input_source_description} ('{file_to_read}') not found.", file=sys.stderr)
             sys.exit(1)
@@ -207,7 +424,12 @@ def main():
             print(f"Error reading {input_source_description} ('{file_to_read}'): {e}", file=sys.stderr)
             sys.exit(1)
 
-    print(json.dumps(output_data, indent=2))
+    instr.count("warnings_found", len(output_data))
+    with instr.phase("write json"):
+        output_json = json.dumps(output_data, indent=2)
+        print(output_json)
+    instr.count("bytes_written", len(output_json))
+    instr.finish()
 
 if __name__ == "__main__":
     main()
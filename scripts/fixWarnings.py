@@ -3,18 +3,36 @@
 import argparse
 import subprocess
 import os
+import re
 import sys
+import time
 import json # For validating JSON from findWarningsByPrefix
 
+import instrument
+
 # --- Configuration ---
-SCRIPTS_DIR = os.path.expanduser("~/scripts")
+# Overridable so the pipeline can run from a checkout (e.g. by benchWarnings.py).
+SCRIPTS_DIR = os.environ.get("FIX_WARNINGS_SCRIPTS_DIR", os.path.expanduser("~/scripts"))
 SAVE_WARNINGS_SCRIPT = os.path.join(SCRIPTS_DIR, "saveWarnings.py")
 FIND_WARNINGS_SCRIPT = os.path.join(SCRIPTS_DIR, "findWarningsByPrefix.py")
 PREPEND_COMMENT_SCRIPT = os.path.join(SCRIPTS_DIR, "prependComment.py")
 
+DEFAULT_MAX_ITERATIONS = 10 # Cap for --until-clean
+
 ENABLE_DEBUG_PRINTING = False # Global debug flag
 # --- End Configuration ---
 
+# Trace files written by child scripts under --profile, merged into ours at exit.
+CHILD_TRACE_FILES = []
+
+# Every prependComment.py pass of this session journals its edits under one run
+# id, so `prependComment.py --rollback --run ID` undoes the whole session.
+SESSION_RUN_ID = f"fixWarnings-{time.strftime('%Y-%m-%dT%H:%M:%S')}-{os.getpid()}"
+EDITS_SUBMITTED = False
+
+# Any compiler warning, used only for the per-iteration summary.
+ANY_WARNING_PATTERN = re.compile(r"^\s*warning: ")
+
 def dprint(*args, **kwargs):
     """Prints debug messages to stderr if ENABLE_DEBUG_PRINTING is True."""
     if ENABLE_DEBUG_PRINTING:
@@ -65,6 +83,200 @@ def run_script_capture_output(script_path, script_args=None, input_data=None):
         return None, None, -1
 
 
+def child_profile_args(label):
+    """Returns ['--profile', PREFIX.<label>.<n>] for a child script when --profile is active."""
+    prefix = instrument.current().profile_prefix
+    if not prefix:
+        return []
+    child_prefix = f"{prefix}.{label}.{len(CHILD_TRACE_FILES) + 1}"
+    CHILD_TRACE_FILES.append(f"{child_prefix}.trace.json")
+    return ["--profile", child_prefix]
+
+def finish_and_exit(exit_code):
+    """Merges child traces, emits --stats/--profile output and exits."""
+    if EDITS_SUBMITTED:
+        print(f"Undo this session's edits with: prependComment.py --rollback --run {SESSION_RUN_ID}",
+              file=sys.stderr)
+    instr = instrument.current()
+    for trace_path in CHILD_TRACE_FILES:
+        if os.path.exists(trace_path):
+            instr.add_trace_file(trace_path)
+    instr.finish()
+    sys.exit(exit_code)
+
+def get_compiler_output(save_args=None):
+    """
+    Runs saveWarnings.py and returns the raw `mix compile` output.
+
+    Returns:
+        str: The compiler output (possibly empty), or None if saveWarnings.py failed.
+    """
+    # Assumption: saveWarnings.py prints the raw `mix compile` output to its stdout.
+    #             If it also saves to a file, that's fine, but we use its stdout.
+    with instrument.phase("compile (saveWarnings.py)"):
+        compiler_output_str, save_err, save_rc = run_script_capture_output(
+            SAVE_WARNINGS_SCRIPT,
+            script_args=(save_args or []) + child_profile_args("saveWarnings")
+        )
+
+    if save_rc != 0 or compiler_output_str is None: # compiler_output_str is None if fundamental error
+        print(f"Error: {SAVE_WARNINGS_SCRIPT} failed or did not produce output.", file=sys.stderr)
+        if save_err:
+            print(f"Stderr from {SAVE_WARNINGS_SCRIPT}:\n{save_err.strip()}", file=sys.stderr)
+        return None
+
+    dprint(f"Raw compiler output received (length: {len(compiler_output_str)})")
+    instrument.count("compiler_output_bytes", len(compiler_output_str))
+    return compiler_output_str
+
+def find_target_warnings(compiler_output_str, find_script_flag):
+    """
+    Runs findWarningsByPrefix.py over the compiler output.
+
+    Returns:
+        list: The parsed warning entries, or None on error.
+    """
+    with instrument.phase("find (findWarningsByPrefix.py)"):
+        json_output_str, find_err, find_rc = run_script_capture_output(
+            FIND_WARNINGS_SCRIPT,
+            script_args=[find_script_flag, "--format", "elixir"] + child_profile_args("findWarningsByPrefix"),
+            input_data=compiler_output_str
+        )
+
+    if find_rc != 0 or json_output_str is None:
+        print(f"Error: {FIND_WARNINGS_SCRIPT} failed.", file=sys.stderr)
+        if find_err:
+            print(f"Stderr from {FIND_WARNINGS_SCRIPT}:\n{find_err.strip()}", file=sys.stderr)
+        return None
+
+    dprint(f"JSON output received from findWarningsByPrefix.py (length: {len(json_output_str)})")
+
+    # Validate the JSON
+    try:
+        parsed_json = json.loads(json_output_str)
+    except json.JSONDecodeError:
+        print(f"Error: Output from {FIND_WARNINGS_SCRIPT} was not valid JSON.", file=sys.stderr)
+        print(f"Received:\n{json_output_str}", file=sys.stderr)
+        if find_err:
+            print(f"Stderr from {FIND_WARNINGS_SCRIPT}:\n{find_err.strip()}", file=sys.stderr)
+        return None
+    if not isinstance(parsed_json, list):
+        print(f"Error: Output from {FIND_WARNINGS_SCRIPT} was not a JSON list.", file=sys.stderr)
+        return None
+    instrument.count("warnings_found", len(parsed_json))
+    return parsed_json
+
+def comment_out_warnings(entries, aliases):
+    """
+    Runs prependComment.py on the given warning entries.
+
+    Returns:
+        bool: True if prependComment.py reported no errors.
+    """
+    # For aliases, let prependComment.py handle whole (possibly multi-line) alias
+    # constructs instead of commenting out only the reported line.
+    global EDITS_SUBMITTED
+    prepend_args = ["--run-id", SESSION_RUN_ID] + (["--fix-aliases"] if aliases else [])
+    EDITS_SUBMITTED = True
+    with instrument.phase("fix (prependComment.py)"):
+        _, prepend_err, prepend_rc = run_script_capture_output(
+            PREPEND_COMMENT_SCRIPT,
+            script_args=prepend_args + child_profile_args("prependComment"),
+            input_data=json.dumps(entries, indent=2)
+        )
+    instrument.count("warnings_submitted_for_fixing", len(entries))
+
+    if prepend_rc != 0:
+        print(f"Error: {PREPEND_COMMENT_SCRIPT} encountered issues.", file=sys.stderr)
+        # prependComment.py prints its own detailed errors to stderr,
+        # so we just print its captured stderr if any *additional* info is there.
+        if prepend_err:
+            print(f"Additional Stderr from {PREPEND_COMMENT_SCRIPT} (if any):\n{prepend_err.strip()}", file=sys.stderr)
+        return False
+    return True
+
+def count_all_warnings(compiler_output_str):
+    """Counts every 'warning:' line in the compiler output, whatever its category."""
+    return sum(1 for line in compiler_output_str.splitlines() if ANY_WARNING_PATTERN.match(line))
+
+def run_until_clean(args, find_script_flag):
+    """
+    Loops compile -> find -> fix until a fixed point or --max-iterations.
+
+    The first compile is always `mix compile --force`: on an already-built
+    project a plain compile reports nothing. Later iterations run a plain
+    `mix compile`, which recompiles just the files we edited (and modules
+    depending on them at compile time), so each round stays incremental and
+    reports warnings for exactly the code we touched. When an incremental
+    compile reports no target warnings, one more forced compile verifies the
+    whole project before it is declared clean. The loop also stops at a fixed
+    point: every target warning reported is one we already tried to fix
+    (entries whose fix failed would otherwise loop forever). A fixed point
+    with warnings left is a failure, and the remaining warnings are listed.
+
+    Returns:
+        int: The exit code for the script.
+    """
+    attempted = set()
+    had_errors = False
+    loop_start = time.monotonic()
+    force_next = True
+
+    for iteration in range(1, args.max_iterations + 1):
+        iteration_start = time.monotonic()
+        forced = force_next
+        force_next = False
+        save_args = ["--force"] if forced else None
+        print(f"--- Iteration {iteration}: compiling{' (forced)' if forced else ''} ---", file=sys.stderr)
+        compiler_output_str = get_compiler_output(save_args)
+        if compiler_output_str is None:
+            return 1
+        compile_seconds = time.monotonic() - iteration_start
+
+        entries = find_target_warnings(compiler_output_str, find_script_flag)
+        if entries is None:
+            return 1
+        new_entries = []
+        for entry in entries:
+            key = (entry.get("fileWithPath"), entry.get("lineNumber"), entry.get("warning"))
+            if key not in attempted:
+                attempted.add(key)
+                new_entries.append(entry)
+
+        fixed_ok = True
+        if new_entries:
+            fixed_ok = comment_out_warnings(new_entries, args.aliases)
+            had_errors = had_errors or not fixed_ok
+        touched_files = {entry.get("fileWithPath") for entry in new_entries}
+
+        scope = "in the project" if forced else "reported by this incremental compile"
+        print(f"Iteration {iteration}: {len(entries)} target warning(s) {scope} "
+              f"({count_all_warnings(compiler_output_str)} warning(s) of any kind), "
+              f"{len(new_entries)} fixed{'' if fixed_ok else ' (with errors)'} in {len(touched_files)} file(s); "
+              f"compile {compile_seconds:.1f}s, iteration {time.monotonic() - iteration_start:.1f}s",
+              file=sys.stderr)
+
+        if not entries and not forced:
+            # Only recompiled files were checked; verify the whole project.
+            force_next = True
+            continue
+        if not entries:
+            print(f"\n--- Clean after {iteration} iteration(s) "
+                  f"({time.monotonic() - loop_start:.1f}s total) ---", file=sys.stderr)
+            return 1 if had_errors else 0
+        if not new_entries:
+            print(f"\n--- Reached a fixed point after {iteration} iteration(s) "
+                  f"({time.monotonic() - loop_start:.1f}s total) with {len(entries)} target warning(s) "
+                  f"{'remaining' if forced else 'reported by the last compile'} ---", file=sys.stderr)
+            for entry in entries:
+                print(f"  {entry.get('fileWithPath')}:{entry.get('lineNumber')}: {entry.get('warning', '').strip()}",
+                      file=sys.stderr)
+            return 1
+
+    print(f"\n--- Stopped after --max-iterations={args.max_iterations} "
+          f"({time.monotonic() - loop_start:.1f}s total); warnings may remain ---", file=sys.stderr)
+    return 1
+
 def main():
     global ENABLE_DEBUG_PRINTING # Allow main to modify the global
     parser = argparse.ArgumentParser(
@@ -82,100 +294,93 @@ def main():
         action="store_true",
         help="Fix '... is undefined or private' warnings."
     )
+    parser.add_argument(
+        "--until-clean",
+        action="store_true",
+        help="Repeat compile -> fix until no target warnings remain (fixing one\n"
+             "warning often exposes another). Exits non-zero, listing them, if\n"
+             "warnings remain that fixing does not remove. Later rounds use incremental\n"
+             "`mix compile`, so only touched files are recompiled; the first\n"
+             "and a final verification compile are forced."
+    )
+    parser.add_argument(
+        "--max-iterations",
+        type=int,
+        default=DEFAULT_MAX_ITERATIONS,
+        help=f"Cap on --until-clean rounds. Defaults to {DEFAULT_MAX_ITERATIONS}."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run the compile as `mix compile --force` so warnings from\n"
+             "already-compiled modules are reported too. --until-clean always\n"
+             "forces its first and final (verification) compiles."
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
         help="Enable detailed debug output for the orchestration script."
     )
+    instrument.add_arguments(parser)
 
     args = parser.parse_args()
+    instrument.activate("fixWarnings", args)
 
     if args.debug:
         ENABLE_DEBUG_PRINTING = True
         dprint("Debug printing enabled for warnFix.py")
 
+    if args.max_iterations < 1:
+        parser.error("--max-iterations must be >= 1")
+
     # --- Validate that all required scripts exist and are executable ---
     required_scripts = [SAVE_WARNINGS_SCRIPT, FIND_WARNINGS_SCRIPT, PREPEND_COMMENT_SCRIPT]
     for script_path in required_scripts:
         if not check_script_exists(script_path):
-            sys.exit(1)
+            finish_and_exit(1)
+
+    find_script_flag = None
+    if args.aliases:
+        find_script_flag = "--unused-alias"
+    elif args.undefined:
+        find_script_flag = "--undefined-private"
+
+    if args.until_clean:
+        finish_and_exit(run_until_clean(args, find_script_flag))
 
     # --- Step 1: Run saveWarnings.py to get compiler output ---
     print("--- Step 1: Getting compiler warnings ---", file=sys.stderr)
-    # Assumption: saveWarnings.py prints the raw `mix compile` output to its stdout.
-    #             If it also saves to a file, that's fine, but we use its stdout.
-    compiler_output_str, save_err, save_rc = run_script_capture_output(SAVE_WARNINGS_SCRIPT)
-
-    if save_rc != 0 or compiler_output_str is None: # compiler_output_str is None if fundamental error
-        print(f"Error: {SAVE_WARNINGS_SCRIPT} failed or did not produce output.", file=sys.stderr)
-        if save_err:
-            print(f"Stderr from {SAVE_WARNINGS_SCRIPT}:\n{save_err.strip()}", file=sys.stderr)
-        sys.exit(1)
+    compiler_output_str = get_compiler_output(["--force"] if args.force else None)
+    if compiler_output_str is None:
+        finish_and_exit(1)
     
     if not compiler_output_str.strip():
         print("Info: No compiler output (warnings/errors) received from `mix compile` via saveWarnings.py.", file=sys.stderr)
         print("Exiting successfully as there's nothing to process.", file=sys.stderr)
-        sys.exit(0)
-
-    dprint(f"Raw compiler output received (length: {len(compiler_output_str)})")
+        finish_and_exit(0)
 
     # --- Step 2: Run findWarningsByPrefix.py to get JSON ---
     print("\n--- Step 2: Identifying target warnings ---", file=sys.stderr)
-    find_script_flag = None
-    if args.aliases:
-        find_script_flag = "--unused-alias"
-    elif args.undefined:
-        find_script_flag = "--undefined-private"
-
-    json_output_str, find_err, find_rc = run_script_capture_output(
-        FIND_WARNINGS_SCRIPT,
-        script_args=[find_script_flag],
-        input_data=compiler_output_str
-    )
-
-    if find_rc != 0 or json_output_str is None:
-        print(f"Error: {FIND_WARNINGS_SCRIPT} failed.", file=sys.stderr)
-        if find_err:
-            print(f"Stderr from {FIND_WARNINGS_SCRIPT}:\n{find_err.strip()}", file=sys.stderr)
-        sys.exit(1)
-
-    dprint(f"JSON output received from findWarningsByPrefix.py (length: {len(json_output_str)})")
-
-    # Validate the JSON and check if it's an empty list (no warnings found)
-    try:
-        parsed_json = json.loads(json_output_str)
-        if isinstance(parsed_json, list) and not parsed_json:
-            print(f"Info: No '{find_script_flag.replace('--','')}' warnings found by {FIND_WARNINGS_SCRIPT}.", file=sys.stderr)
-            print("Exiting successfully as there's nothing to fix.", file=sys.stderr)
-            sys.exit(0)
-    except json.JSONDecodeError:
-        print(f"Error: Output from {FIND_WARNINGS_SCRIPT} was not valid JSON.", file=sys.stderr)
-        print(f"Received:\n{json_output_str}", file=sys.stderr)
-        if find_err:
-            print(f"Stderr from {FIND_WARNINGS_SCRIPT}:\n{find_err.strip()}", file=sys.stderr)
-        sys.exit(1)
+    parsed_json = find_target_warnings(compiler_output_str, find_script_flag)
+    if parsed_json is None:
+        finish_and_exit(1)
 
+    # Check if it's an empty list (no warnings found)
+    if not parsed_json:
+        print(f"Info: No '{find_script_flag.replace('--','')}' warnings found by {FIND_WARNINGS_SCRIPT}.", file=sys.stderr)
+        print("Exiting successfully as there's nothing to fix.", file=sys.stderr)
+        finish_and_exit(0)
 
     # --- Step 3: Run prependComment.py to modify files ---
     print("\n--- Step 3: Commenting out warnings in source files ---", file=sys.stderr)
-    _, prepend_err, prepend_rc = run_script_capture_output(
-        PREPEND_COMMENT_SCRIPT,
-        input_data=json_output_str
-    )
-
-    if prepend_rc != 0:
-        print(f"Error: {PREPEND_COMMENT_SCRIPT} encountered issues.", file=sys.stderr)
-        # prependComment.py prints its own detailed errors to stderr,
-        # so we just print its captured stderr if any *additional* info is there.
-        if prepend_err:
-            print(f"Additional Stderr from {PREPEND_COMMENT_SCRIPT} (if any):\n{prepend_err.strip()}", file=sys.stderr)
-        sys.exit(1)
+    if not comment_out_warnings(parsed_json, args.aliases):
+        finish_and_exit(1)
     
     # If prependComment.py also prints success messages to its stdout, we might want to show them.
     # For now, assume its stderr is sufficient for status.
 
     print("\n--- Warning Fix Pipeline Completed Successfully ---", file=sys.stderr)
-    sys.exit(0)
+    finish_and_exit(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+"""
+Gitignore-aware path matching shared by the file-walking scripts
+(codeReport.py, treeSize.sh, find_large_ex_files.sh).
+
+.gitignore files plus a default ignore set (deps/, _build/, node_modules/, .git, ...)
+are compiled into regexes once per directory, and whole directories are pruned
+before they are descended into, so a walk costs time proportional to the source
+tree rather than the dependency tree.
+"""
+
+import os
+import re
+import sys
+
+# --- Configuration ---
+# Applied below every .gitignore, i.e. a .gitignore can re-include them with '!'.
+# Names that are also plausible source directories are anchored ("/...") to the
+# walk root, so e.g. lib/my_app/target/ is still walked.
+DEFAULT_IGNORE_PATTERNS = [
+    ".git/",
+    "deps/",
+    "_build/",
+    "node_modules/",
+    ".elixir_ls/",
+    ".lexical/",
+    "/cover/",
+    "__pycache__/",
+    ".venv/",
+    "/venv/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    "/target/",
+]
+GITIGNORE_FILENAME = ".gitignore"
+# --- End Configuration ---
+
+
+def translate_pattern(pattern):
+    """
+    Translates one .gitignore line into a regex matched against paths relative
+    to the directory holding that .gitignore.
+
+    Args:
+        pattern (str): A raw line from a .gitignore file.
+
+    Returns:
+        tuple: (regex_string, negated, dir_only), or None for blank lines and comments.
+    """
+    line = pattern.rstrip("\n").rstrip("\r")
+    if not line.strip() or line.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped with a backslash.
+    if not line.endswith("\\ "):
+        line = line.rstrip(" ")
+
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    if line.startswith("\\"):
+        line = line[1:]  # "\#foo" and "\!foo" match literal names
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to the .gitignore's directory.
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    parts = []
+    i = 0
+    n = len(line)
+    while i < n:
+        c = line[i]
+        if c == "*":
+            if line.startswith("**", i):
+                at_segment_start = i == 0 or line[i - 1] == "/"
+                if at_segment_start and line.startswith("**/", i):
+                    parts.append("(?:.*/)?")
+                    i += 3
+                    continue
+                if at_segment_start and i + 2 == n:
+                    parts.append(".*")
+                    i += 2
+                    continue
+                parts.append("[^/]*")
+                i += 2
+                continue
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            end = line.find("]", i + 2 if line.startswith("[!", i) or line.startswith("[^", i) else i + 1)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = line[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            parts.append(re.escape(line[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"^{prefix}{''.join(parts)}$", negated, dir_only
+
+
+class IgnoreRules:
+    """The compiled rules of one .gitignore (or the default set), relative to `base`."""
+
+    def __init__(self, base, patterns):
+        self.base = base  # Relative to the matcher root; "" for the root itself.
+        self.rules = []
+        for pattern in patterns:
+            translated = translate_pattern(pattern)
+            if translated:
+                regex, negated, dir_only = translated
+                self.rules.append((re.compile(regex), negated, dir_only))
+
+        # Without negations, last-match-wins collapses into "any rule matches",
+        # so all rules fold into one alternation per entry type.
+        self.has_negations = any(negated for _, negated, _ in self.rules)
+        if not self.has_negations:
+            self.any_file = self._combine(r for r, _, dir_only in self.rules if not dir_only)
+            self.any_dir = self._combine(r for r, _, _ in self.rules)
+
+    @staticmethod
+    def _combine(regexes):
+        sources = [r.pattern for r in regexes]
+        if not sources:
+            return None
+        return re.compile("|".join(f"(?:{source})" for source in sources))
+
+    def match(self, rel_path, is_dir):
+        """Returns True (ignored), False (re-included by '!') or None (no rule matched)."""
+        if not self.has_negations:
+            combined = self.any_dir if is_dir else self.any_file
+            return True if combined is not None and combined.match(rel_path) else None
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negated
+        return None
+
+
+class IgnoreMatcher:
+    """
+    Decides which paths under `root` are ignored, honouring nested .gitignore files.
+
+    Rule sets are kept as a chain per directory (deepest first), built lazily and
+    cached, so each .gitignore is read and compiled at most once per walk.
+    """
+
+    def __init__(self, root, use_defaults=True, use_gitignore=True, extra_patterns=None):
+        self.root = root
+        self.use_gitignore = use_gitignore
+        base_patterns = list(DEFAULT_IGNORE_PATTERNS) if use_defaults else []
+        base_patterns.extend(extra_patterns or [])
+        self._chains = {"": self._with_gitignore([IgnoreRules("", base_patterns)], "")}
+
+    def _with_gitignore(self, parent_chain, rel_dir):
+        if not self.use_gitignore:
+            return parent_chain
+        gitignore_path = os.path.join(self.root, rel_dir, GITIGNORE_FILENAME)
+        try:
+            with open(gitignore_path, "r", encoding="utf-8", errors="replace") as f:
+                rules = IgnoreRules(rel_dir, f.readlines())
+        except FileNotFoundError:
+            return parent_chain
+        except OSError as e:
+            print(f"Warning: Cannot read '{gitignore_path}': {e}. Ignoring it.", file=sys.stderr)
+            return parent_chain
+        return [rules] + parent_chain
+
+    def _chain_for(self, rel_dir):
+        chain = self._chains.get(rel_dir)
+        if chain is None:
+            parent = rel_dir.rpartition("/")[0]
+            chain = self._with_gitignore(self._chain_for(parent), rel_dir)
+            self._chains[rel_dir] = chain
+        return chain
+
+    def _is_ignored_in(self, chain, rel_path, is_dir):
+        for rules in chain:
+            path = rel_path[len(rules.base) + 1:] if rules.base else rel_path
+            decision = rules.match(path, is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    def relative(self, path):
+        rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+        return "" if rel == "." else rel
+
+    def is_ignored(self, path, is_dir):
+        """Checks a single path (absolute or relative to the cwd), including its parents."""
+        rel = self.relative(path)
+        if not rel or rel.startswith("../"):
+            return False
+        parts = rel.split("/")
+        for depth in range(1, len(parts) + 1):
+            rel_dir = "/".join(parts[:depth - 1])
+            entry_is_dir = is_dir or depth < len(parts)
+            if self._is_ignored_in(self._chain_for(rel_dir), "/".join(parts[:depth]), entry_is_dir):
+                return True
+        return False
+
+    def filter_entries(self, dir_path, subdirs, files):
+        """
+        Drops ignored entries from one directory listing (used by fileWalk.walk_tree).
+
+        Returns:
+            tuple: (kept_subdir_entries, kept_file_entries)
+        """
+        rel_dir = self.relative(dir_path)
+        chain = self._chains.get(rel_dir)
+        if chain is None:
+            # The listing already tells us whether a .gitignore exists here,
+            # which saves a failed open() for every directory in the tree.
+            chain = self._chain_for(rel_dir.rpartition("/")[0])
+            if any(e.name == GITIGNORE_FILENAME for e in files):
+                chain = self._with_gitignore(chain, rel_dir)
+            self._chains[rel_dir] = chain
+        prefix = rel_dir + "/" if rel_dir else ""
+        kept_dirs = [e for e in subdirs if not self._is_ignored_in(chain, prefix + e.name, True)]
+        kept_files = [e for e in files if not self._is_ignored_in(chain, prefix + e.name, False)]
+        return kept_dirs, kept_files
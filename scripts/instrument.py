@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+"""
+Shared phase-timing and profiling layer for the warning pipeline
+(saveWarnings.py, findWarningsByPrefix.py, prependComment.py, fixWarnings.py).
+
+Each script activates one Instrumentation and wraps its work in phases:
+
+    instr = instrument.activate("prependComment", args)
+    with instr.phase("apply edits"):
+        ...
+    instrument.count("bytes_written", len(data))
+    instr.finish()
+
+Per-phase wall and CPU time plus counters (lines parsed, files touched, bytes
+read/written) are printed with --stats. --profile PREFIX additionally writes
+PREFIX.pstats (cProfile, open with `python3 -m pstats`) and PREFIX.trace.json
+(Chrome trace; load in chrome://tracing or https://ui.perfetto.dev).
+"""
+
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """Records phases and counters for one script run."""
+
+    def __init__(self, name, profile_prefix=None, print_stats=False):
+        self.name = name
+        self.profile_prefix = profile_prefix
+        self.print_stats = print_stats
+        self.phases = []    # (name, start_us, wall_seconds, cpu_seconds)
+        self.counters = {}
+        self.extra_trace_events = []
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._profiler = None
+        if profile_prefix:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    @property
+    def enabled(self):
+        return bool(self.profile_prefix or self.print_stats)
+
+    @contextmanager
+    def phase(self, name):
+        """Times a block. Wall-clock timestamps are absolute so traces from several processes line up."""
+        start_us = time.time() * 1e6
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start_us, time.perf_counter() - wall, time.process_time() - cpu))
+
+    def count(self, key, amount=1):
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def add_trace_file(self, path):
+        """Merges another process's trace (e.g. a child script's) into this one's output."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                trace = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not merge trace '{path}': {e}", file=sys.stderr)
+            return
+        self.extra_trace_events.extend(trace.get("traceEvents", []))
+
+    def summary_lines(self):
+        total_wall = time.perf_counter() - self._start_wall
+        total_cpu = time.process_time() - self._start_cpu
+        lines = [f"{self.name}: total {total_wall:.3f}s wall, {total_cpu:.3f}s CPU"]
+        for name, _, wall, cpu in self.phases:
+            share = (wall / total_wall * 100) if total_wall else 0.0
+            lines.append(f"  {name:<32} {wall:>9.3f}s wall {cpu:>9.3f}s CPU {share:>5.1f}%")
+        for key, value in sorted(self.counters.items()):
+            lines.append(f"  {key:<32} {value:>12,}")
+        return lines
+
+    def trace_events(self):
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.name}}]
+        for name, start_us, wall, cpu in self.phases:
+            events.append({
+                "name": name, "cat": "phase", "ph": "X", "pid": pid, "tid": 0,
+                "ts": round(start_us), "dur": round(wall * 1e6),
+                "args": {"cpu_ms": round(cpu * 1000, 3)},
+            })
+        if self.counters:
+            events.append({"name": "counters", "ph": "C", "pid": pid, "tid": 0,
+                           "ts": round(time.time() * 1e6), "args": dict(self.counters)})
+        return events + self.extra_trace_events
+
+    def finish(self):
+        """Stops profiling and writes/prints whatever --profile/--stats asked for."""
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.print_stats:
+            print("\n".join(self.summary_lines()), file=sys.stderr)
+        if not self.profile_prefix:
+            return
+
+        pstats_path = f"{self.profile_prefix}.pstats"
+        trace_path = f"{self.profile_prefix}.trace.json"
+        try:
+            self._profiler.dump_stats(pstats_path)
+            with open(trace_path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": self.trace_events(), "otherData": {"counters": self.counters}}, f)
+        except OSError as e:
+            print(f"Error writing profile output for '{self.profile_prefix}': {e}", file=sys.stderr)
+            return
+        print(f"{self.name}: profile written to '{pstats_path}' and '{trace_path}'", file=sys.stderr)
+
+
+class _NullInstrumentation(Instrumentation):
+    """Default when a module is used without activate(); records nothing."""
+
+    def __init__(self):
+        super().__init__("inactive")
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def count(self, key, amount=1):
+        pass
+
+
+_current = _NullInstrumentation()
+
+
+def add_arguments(parser):
+    """Adds the shared --stats and --profile flags to a script's argparse parser."""
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print per-phase wall/CPU time and counters to stderr when done."
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="Write PREFIX.pstats (cProfile) and PREFIX.trace.json (Chrome trace)."
+    )
+
+
+def activate(name, args=None):
+    """Creates the Instrumentation for this process from parsed --stats/--profile args."""
+    global _current
+    _current = Instrumentation(
+        name,
+        profile_prefix=getattr(args, "profile", None),
+        print_stats=getattr(args, "stats", False),
+    )
+    return _current
+
+
+def current():
+    return _current
+
+
+def phase(name):
+    return _current.phase(name)
+
+
+def count(key, amount=1):
+    _current.count(key, amount)
+
+
+def counting_lines(lines_iterator, counter="lines_parsed"):
+    """Passes lines through while counting them (and their bytes) in the current Instrumentation."""
+    instr = _current
+    if isinstance(instr, _NullInstrumentation):
+        yield from lines_iterator
+        return
+    lines = 0
+    size = 0
+    try:
+        for line in lines_iterator:
+            lines += 1
+            size += len(line)
+            yield line
+    finally:
+        instr.count(counter, lines)
+        instr.count("bytes_read", size)
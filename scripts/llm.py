@@ -13,6 +13,9 @@ from google import genai
 import os
 import sys
 import argparse
+import atexit
+
+from llmScheduler import RequestScheduler, DEFAULT_MAX_RETRIES
 
 # --- Configuration ---
 # These are the model aliases from your original script.
@@ -24,6 +27,12 @@ DEFAULT_MODEL = "gemini-2.5-flash-lite-preview-06-17"
 #DEFAULT_MODEL = "models/gemini-2.5-pro"
 FLASH_MODEL = "models/gemini-2.5-flash-lite-preview-06-17"
 PRO_MODEL = "models/gemini-2.5-pro"
+# Client-side rate limits per model: (requests per minute, burst). Flash and
+# Pro have separate quotas; keep these at or below your tier's limits.
+RATE_LIMITS = {
+    FLASH_MODEL: (15, 5),
+    PRO_MODEL: (5, 2),
+}
 
 def main():
     parser = argparse.ArgumentParser(
@@ -35,6 +44,22 @@ def main():
         action='store_true',
         help=f"Use the Gemini Pro model ({PRO_MODEL}) instead of Flash ({DEFAULT_MODEL})."
     )
+    parser.add_argument(
+        '--base-url',
+        default=os.environ.get("GEMINI_BASE_URL"),
+        help="API base URL, e.g. a local fakeGeminiServer.py. Defaults to $GEMINI_BASE_URL or Google's endpoint."
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f"Retries on 429/5xx or dropped connections before giving up. Defaults to {DEFAULT_MAX_RETRIES}."
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help="Print request, retry and throttling counters to stderr when done."
+    )
     parser.add_argument(
         'prompt_parts',
         nargs='*',
@@ -47,7 +72,8 @@ def main():
     try:
         api_key = os.environ["GEMINI_API_KEY"]
         # Original SDK initialization: genai.configure(api_key=api_key)
-        client = genai.Client(api_key=api_key) # New way to initialize with API key
+        http_options = {"base_url": args.base_url} if args.base_url else None
+        client = genai.Client(api_key=api_key, http_options=http_options) # New way to initialize with API key
     except KeyError:
         print("Error: The GEMINI_API_KEY environment variable is not set.", file=sys.stderr)
         sys.exit(1)
@@ -77,6 +103,11 @@ def main():
     # print(f"Prompt: \"{prompt}\"", file=sys.stderr) # For debugging
 
     # 4. Generate Content (Streaming)
+    # The scheduler rate-limits per model, retries transient errors with
+    # backoff and resumes a stream that is cut off mid-way.
+    scheduler = RequestScheduler(client, limits=RATE_LIMITS, max_retries=args.max_retries)
+    if args.stats:
+        atexit.register(lambda: print("llm: " + "\nllm: ".join(scheduler.summary_lines()), file=sys.stderr))
     try:
         # Original model initialization:
         # model = genai.GenerativeModel(model_name)
@@ -86,19 +117,11 @@ def main():
         # New API call for streaming generation:
         # The 'contents' parameter expects an iterable (e.g., a list).
         # For a simple text prompt, it's a list containing one string.
-        response_stream = client.models.generate_content_stream(
-            model=model_name,
-            contents=[prompt] 
-        )
-
-        for chunk in response_stream:
-            # The original script checked 'if chunk.text:' to handle cases where
-            # chunk.text might be None or an empty string. This also helps
-            # avoid issues if chunk itself was None (which would be caught by the AttributeError below).
-            # This check is good for robustness and kept from the original script.
-            # The 'flush=True' is also kept for better interactive terminal output.
-            if chunk.text: 
-                print(chunk.text, end="", flush=True)
+        # scheduler.stream_text() calls client.models.generate_content_stream()
+        # and yields only non-empty chunk.text pieces.
+        for text in scheduler.stream_text(model_name, prompt):
+            # The 'flush=True' is kept for better interactive terminal output.
+            print(text, end="", flush=True)
         print() # Add a final newline for cleaner terminal output
 
     except AttributeError as e:
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+"""
+Rate-limit-aware request scheduling for llm.py.
+
+RequestScheduler wraps a google.genai Client's streaming calls with:
+
+  - a token bucket per model (Flash and Pro have different quotas). The
+    bucket state lives in a small lock-protected file, so the limit holds
+    across the many short llm.py processes a scripted run starts.
+  - retries with jittered exponential backoff on 429/5xx responses and
+    dropped connections, honouring the server's RetryInfo delay when given.
+  - resuming a stream cut mid-way: the text received so far is sent back as
+    a model turn with an instruction to continue, and only the new text is
+    yielded.
+
+Counters for requests, retries, resumes and throttled/backoff time are kept
+on the scheduler (summary_lines()) and printed by `llm.py --stats`.
+"""
+
+import fcntl
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+# --- Configuration ---
+DEFAULT_RATE_LIMIT = (10, 3)    # (requests per minute, burst) for models without an entry
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BASE_DELAY = 1.0        # seconds; doubled per attempt, then jittered
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_STATE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                                  "llm", "ratelimit.json")
+CONTINUE_INSTRUCTION = ("Your previous response was cut off. Continue exactly where it stopped, "
+                        "without repeating any of it and without any preamble.")
+MIN_RESUME_OVERLAP = 8          # Shortest repeated prefix trimmed from a resumed stream.
+# --- End Configuration ---
+
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+# Network failures from the SDK's HTTP layer (httpx), matched by class name so
+# this module does not need httpx itself.
+RETRYABLE_ERROR_NAMES = {"TransportError", "RemoteProtocolError", "ReadError", "WriteError", "ConnectError",
+                         "TimeoutException", "ChunkedEncodingError", "IncompleteRead"}
+
+
+def normalize_model(model):
+    """'models/gemini-2.5-pro' and 'gemini-2.5-pro' share one bucket."""
+    return model[len("models/"):] if model.startswith("models/") else model
+
+
+def error_code(error):
+    """The HTTP status of an API error (google.genai.errors.APIError has .code), or None."""
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error):
+    code = error_code(error)
+    if code is not None:
+        return code in RETRYABLE_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait (RetryInfo.retryDelay, e.g. '30s'), or None."""
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        # Some errors carry a plain-string "error"; that has no RetryInfo to read.
+        body = details.get("error", details)
+        details = body.get("details") if isinstance(body, dict) else None
+    if not isinstance(details, list):
+        return None
+    for detail in details:
+        if isinstance(detail, dict) and str(detail.get("@type", "")).endswith("RetryInfo"):
+            match = re.match(r"^\s*([\d.]+)s\s*$", str(detail.get("retryDelay", "")))
+            if match:
+                return float(match.group(1))
+    return None
+
+
+class TokenBucket:
+    """
+    Blocks callers to at most `rate_per_minute` requests per minute, allowing
+    bursts of `burst`. With `state_path`, the bucket is shared (under flock)
+    by every process using the same file and `key`.
+    """
+
+    def __init__(self, rate_per_minute, burst, state_path=None, key="default", sleep=time.sleep, clock=time.time):
+        self.rate = rate_per_minute / 60.0
+        self.burst = float(burst)
+        self.state_path = state_path
+        self.key = key
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _take(self, tokens, updated):
+        """Refills, reserves one token (possibly going negative) and returns (tokens, now, wait)."""
+        now = self._clock()
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, now, wait
+
+    def acquire(self):
+        """Takes one token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            if self.state_path:
+                wait = self._take_shared()
+            else:
+                self._tokens, self._updated, wait = self._take(self._tokens, self._updated)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def _take_shared(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            with open(self.state_path, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                tokens, updated = state.get(self.key, (self.burst, self._clock()))
+                tokens, now, wait = self._take(tokens, updated)
+                state[self.key] = (tokens, now)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                return wait
+        except OSError as e:
+            print(f"Warning: Rate-limit state '{self.state_path}' unusable ({e}); limiting this process only.",
+                  file=sys.stderr)
+            self.state_path = None
+            self._tokens, self._updated, wait = self._take(self._tokens, self._updated)
+            return wait
+
+
+class RequestScheduler:
+    """
+    Runs generate_content_stream calls under per-model rate limits, with
+    retries and stream resumption.
+
+    Args:
+        client: A google.genai Client (anything with client.models.generate_content_stream).
+        limits (dict): Model name -> (requests per minute, burst).
+        state_path (str or None): Shared bucket state file; None keeps buckets in-process.
+    """
+
+    def __init__(self, client, limits=None, default_limit=DEFAULT_RATE_LIMIT, max_retries=DEFAULT_MAX_RETRIES,
+                 base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, state_path=DEFAULT_STATE_PATH,
+                 sleep=time.sleep, rng=None):
+        self.client = client
+        self.limits = {normalize_model(model): limit for model, limit in (limits or {}).items()}
+        self.default_limit = default_limit
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state_path = state_path
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._buckets = {}
+        self.counters = {"requests": 0, "retries": 0, "resumes": 0, "throttled_seconds": 0.0,
+                         "backoff_seconds": 0.0}
+        self.errors = {}
+
+    def bucket(self, model):
+        model = normalize_model(model)
+        if model not in self._buckets:
+            rate, burst = self.limits.get(model, self.default_limit)
+            self._buckets[model] = TokenBucket(rate, burst, self.state_path, key=model, sleep=self._sleep)
+        return self._buckets[model]
+
+    def backoff_delay(self, attempt, error):
+        """Full-jitter exponential backoff, but never shorter than the server's RetryInfo."""
+        delay = self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        requested = retry_after(error)
+        return max(delay, requested) if requested is not None else delay
+
+    @staticmethod
+    def build_contents(prompt, partial):
+        if not partial:
+            return [prompt]
+        return [
+            {"role": "user", "parts": [{"text": prompt}]},
+            {"role": "model", "parts": [{"text": partial}]},
+            {"role": "user", "parts": [{"text": CONTINUE_INSTRUCTION}]},
+        ]
+
+    @staticmethod
+    def trim_overlap(partial, text):
+        """Drops a prefix of `text` that merely repeats the end of `partial`."""
+        for size in range(min(len(partial), len(text)), MIN_RESUME_OVERLAP - 1, -1):
+            if partial.endswith(text[:size]):
+                return text[size:]
+        return text
+
+    def stream_text(self, model, prompt):
+        """
+        Yields the response text for `prompt` piece by piece, retrying and
+        resuming as needed. Raises the last error once retries run out or on
+        a non-retryable error.
+        """
+        partial = ""
+        attempt = 0
+        while True:
+            self.counters["throttled_seconds"] += self.bucket(model).acquire()
+            self.counters["requests"] += 1
+            resuming = bool(partial)
+            received_before = len(partial)
+            try:
+                stream = self.client.models.generate_content_stream(
+                    model=model, contents=self.build_contents(prompt, partial)
+                )
+                for chunk in stream:
+                    text = chunk.text if chunk is not None else None
+                    if not text:
+                        continue
+                    if resuming:
+                        text = self.trim_overlap(partial, text)
+                        resuming = False
+                        if not text:
+                            continue
+                    partial += text
+                    yield text
+                return
+            except Exception as e:
+                code = error_code(e)
+                key = str(code) if code is not None else type(e).__name__
+                self.errors[key] = self.errors.get(key, 0) + 1
+                if not is_retryable(e):
+                    raise
+                # Progress since the last failure earns a fresh set of retries.
+                if len(partial) > received_before:
+                    attempt = 0
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                attempt += 1
+                self.counters["retries"] += 1
+                if partial:
+                    self.counters["resumes"] += 1
+                what = f"stream cut after {len(partial)} chars, resuming" if partial else "retrying"
+                print(f"\nllm: {key} ({e.__class__.__name__}); {what} in {delay:.1f}s "
+                      f"(attempt {attempt}/{self.max_retries})", file=sys.stderr)
+                self.counters["backoff_seconds"] += delay
+                self._sleep(delay)
+
+    def summary_lines(self):
+        c = self.counters
+        lines = [f"requests {c['requests']}, retries {c['retries']}, resumes {c['resumes']}",
+                 f"throttled {c['throttled_seconds']:.2f}s, backoff {c['backoff_seconds']:.2f}s"]
+        if self.errors:
+            lines.append("errors: " + ", ".join(f"{key} x{count}" for key, count in sorted(self.errors.items())))
+        return lines
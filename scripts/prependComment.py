@@ -1,73 +1,443 @@
 #!/usr/bin/env python3
 
 import argparse
+import difflib
+import hashlib
 import json
 import sys
 import os
+import time
 
-def prepend_to_line_in_file(file_path, line_number_str):
+import instrument
+from aliasFixer import alias_name_from_warning, plan_alias_edits
+
+# --- Configuration ---
+# Every edit pass appends the original lines it replaced to a per-project journal
+# here, so a bad batch can be undone with --rollback instead of `git checkout`
+# (which also drops unrelated work). Only the newest JOURNAL_KEEP_RUNS runs are kept.
+JOURNAL_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                           "prependComment")
+JOURNAL_KEEP_RUNS = 50
+DIFF_CONTEXT_LINES = 3
+# Line-comment prefix by file extension; anything not listed gets DEFAULT_COMMENT_PREFIX
+# (Elixir, Python, shell, ...).
+SLASH_COMMENT_EXTENSIONS = {".ts", ".tsx", ".mts", ".cts", ".js", ".jsx", ".mjs", ".cjs", ".rs",
+                            ".go", ".c", ".h", ".cc", ".cpp", ".hpp", ".java", ".kt", ".swift"}
+DEFAULT_COMMENT_PREFIX = "# "
+# --- End Configuration ---
+
+def comment_prefix_for(file_path):
+    """The line-comment prefix for a source file, chosen by extension."""
+    if os.path.splitext(file_path)[1].lower() in SLASH_COMMENT_EXTENSIONS:
+        return "// "
+    return DEFAULT_COMMENT_PREFIX
+
+
+def default_journal_path(start_dir=None):
     """
-    Prepends '# ' to a specific line in a file.
+    The journal for the project containing `start_dir` (the cwd by default):
+    the nearest ancestor with a .git, else the directory itself.
+    """
+    root = os.path.abspath(start_dir or os.getcwd())
+    probe = root
+    while True:
+        if os.path.exists(os.path.join(probe, ".git")):
+            root = probe
+            break
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            break
+        probe = parent
+    digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(JOURNAL_DIR, f"{os.path.basename(root) or 'root'}-{digest}.journal.jsonl")
 
-    Args:
-        file_path (str): The path to the file to modify.
-        line_number_str (str): The line number (1-indexed) as a string.
+def parse_line_number(file_path, line_number_str):
+    """
+    Validates a 1-indexed line number given as a string.
 
     Returns:
-        bool: True if successful, False otherwise.
+        int: The line number, or None (after printing an error) if it is invalid.
     """
     try:
         line_number = int(line_number_str)
-        if line_number < 1:
-            print(f"Error: Line number '{line_number_str}' for file '{file_path}' is invalid (must be >= 1). Skipping.", file=sys.stderr)
-            return False
     except ValueError:
         print(f"Error: Line number '{line_number_str}' for file '{file_path}' is not a valid integer. Skipping.", file=sys.stderr)
-        return False
+        return None
+    if line_number < 1:
+        print(f"Error: Line number '{line_number_str}' for file '{file_path}' is invalid (must be >= 1). Skipping.", file=sys.stderr)
+        return None
+    return line_number
+
+
+def plan_prepend_edits(file_path, lines, line_numbers, dry_run=False):
+    """
+    Plans comment-prefix prepends ('# ', or '// ' for TypeScript, Rust, ...)
+    for the given lines of one file.
+
+    Returns:
+        tuple: (hunks, ok_count, error_count) where each hunk is
+               (start_index, old_lines, new_lines) as in aliasFixer.py.
+    """
+    hunks = []
+    ok_count = 0
+    error_count = 0
+    seen = set()
+    prefix = comment_prefix_for(file_path)
+    for line_number in line_numbers:
+        line_index = line_number - 1
+        if not 0 <= line_index < len(lines):
+            print(f"Error: Line number {line_number} is out of range for file '{file_path}' (Total lines: {len(lines)}). Skipping.", file=sys.stderr)
+            error_count += 1
+            continue
+
+        original_line = lines[line_index]
+        # Avoid double-commenting if already commented in this specific way
+        # This is a simple check, could be made more robust if needed
+        if line_index in seen or original_line.lstrip().startswith(prefix):
+            print(f"Info: Line {line_number} in '{file_path}' already starts with '{prefix}'. Skipping prepend.", file=sys.stderr)
+            ok_count += 1 # Considered successful as the desired state is achieved
+            continue
+
+        seen.add(line_index)
+        hunks.append((line_index, [original_line], [f"{prefix}{original_line}"])) # Original newline is preserved
+        verb = "Would prepend" if dry_run else "Successfully prepended"
+        print(f"{verb} '{prefix}' to line {line_number} in '{file_path}'", file=sys.stderr)
+        ok_count += 1
+    return hunks, ok_count, error_count
+
+
+def apply_hunks(lines, hunks):
+    """
+    Applies (start_index, old_lines, new_lines) hunks to a list of lines.
+
+    Hunks are applied bottom-up so that hunks which change the line count do not
+    shift the positions of the ones above them.
+
+    Returns:
+        list: The new lines.
+    """
+    new_lines = list(lines)
+    for start_index, old_lines, replacement in sorted(hunks, key=lambda hunk: hunk[0], reverse=True):
+        new_lines[start_index:start_index + len(old_lines)] = replacement
+    return new_lines
+
+
+def _with_newline(line):
+    return line if line.endswith("\n") else line + "\n\\ No newline at end of file\n"
+
+
+def format_unified_diff(file_path, lines, hunks, context=DIFF_CONTEXT_LINES):
+    """
+    Renders hunks as a unified diff without running a general diff algorithm.
+
+    We already know exactly which lines change, so nearby hunks are merged and
+    wrapped in `context` lines directly; this stays fast for thousands of edits.
 
-    # Convert to 0-indexed for list access
-    line_index = line_number - 1
+    Returns:
+        str: The diff text ('' if there are no hunks).
+    """
+    ordered = sorted(hunks, key=lambda hunk: hunk[0])
+    groups = []
+    for hunk in ordered:
+        if groups and hunk[0] - (groups[-1][-1][0] + len(groups[-1][-1][1])) <= 2 * context:
+            groups[-1].append(hunk)
+        else:
+            groups.append([hunk])
+
+    display_path = file_path.lstrip("/")
+    out = [f"--- a/{display_path}\n", f"+++ b/{display_path}\n"]
+    delta = 0  # Line-count change from groups above the current one.
+    for group in groups:
+        first_start = group[0][0]
+        last_end = group[-1][0] + len(group[-1][1])
+        old_start = max(0, first_start - context)
+        old_end = min(len(lines), last_end + context)
+
+        body = []
+        position = old_start
+        group_delta = 0
+        for start_index, old_lines, new_lines in group:
+            body.extend(" " + _with_newline(line) for line in lines[position:start_index])
+            body.extend("-" + _with_newline(line) for line in old_lines)
+            body.extend("+" + _with_newline(line) for line in new_lines)
+            position = start_index + len(old_lines)
+            group_delta += len(new_lines) - len(old_lines)
+        body.extend(" " + _with_newline(line) for line in lines[position:old_end])
+
+        old_count = old_end - old_start
+        new_count = old_count + group_delta
+        out.append(f"@@ -{old_start + 1},{old_count} +{old_start + 1 + delta},{new_count} @@\n")
+        out.extend(body)
+        delta += group_delta
+    return "".join(out)
+
+
+class EditJournal:
+    """
+    Append-only JSON-lines record of every edit pass.
+
+    Each line is one file of one run:
+        {"run": ..., "file": "/abs/path", "hunks": [{"line": N, "old": [...], "new": [...]}]}
+    where `line` is 1-indexed in the file *after* that run's edits, so a rollback
+    can replay runs newest-first and restore exactly the edited lines. A rollback
+    appends {"rolled_back": RUN} so the run is not restored twice.
 
+    Several processes can share one run id (fixWarnings.py --until-clean
+    passes its session id to every pass), so one rollback undoes them all.
+
+    Opening the journal drops all but the newest JOURNAL_KEEP_RUNS runs.
+    """
+
+    def __init__(self, path, keep_runs=JOURNAL_KEEP_RUNS, run_id=None):
+        self.path = path
+        self.run_id = run_id or f"{time.strftime('%Y-%m-%dT%H:%M:%S')}-{os.getpid()}"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        trim_journal(path, keep_runs - 1)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, file_path, hunks):
+        entries = []
+        delta = 0
+        for start_index, old_lines, new_lines in sorted(hunks, key=lambda hunk: hunk[0]):
+            entries.append({"line": start_index + delta + 1, "old": old_lines, "new": new_lines})
+            delta += len(new_lines) - len(old_lines)
+        record = {"run": self.run_id, "file": os.path.abspath(file_path), "hunks": entries}
+        # Called only after the file was written, so a failed write leaves no entry to undo.
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _journal_run(raw):
+    """The run a journal line belongs to (edit record or rollback marker), or None."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        record = json.loads(raw)
+        return record.get("run") or record.get("rolled_back")
+    except (json.JSONDecodeError, AttributeError):
+        return None
 
-        if 0 <= line_index < len(lines):
-            # Prepend '# ' to the line.
-            # lines[line_index] already includes a newline if it's not the last line without one.
-            original_line = lines[line_index]
-            
-            # Avoid double-commenting if already commented in this specific way
-            # This is a simple check, could be made more robust if needed
-            if original_line.lstrip().startswith("# "):
-                print(f"Info: Line {line_number} in '{file_path}' already starts with '# '. Skipping prepend.", file=sys.stderr)
-                return True # Considered successful as the desired state is achieved
+def trim_journal(journal_path, keep_runs):
+    """Rewrites the journal with only the newest `keep_runs` runs, if it holds more."""
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            raw_lines = f.readlines()
+    except FileNotFoundError:
+        return
+    run_ids = []
+    for raw in raw_lines:
+        run = _journal_run(raw)
+        if run and run not in run_ids:
+            run_ids.append(run)
+    if len(run_ids) <= keep_runs:
+        return
+    kept = set(run_ids[len(run_ids) - keep_runs:]) if keep_runs > 0 else set()
+    tmp_path = f"{journal_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.writelines(raw for raw in raw_lines if _journal_run(raw) in kept)
+    os.replace(tmp_path, journal_path)
 
-            lines[line_index] = f"# {original_line}" # Original newline is preserved
+def read_journal(journal_path):
+    """
+    Parses a journal.
 
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-            print(f"Successfully prepended '# ' to line {line_number} in '{file_path}'", file=sys.stderr)
-            return True
+    Returns:
+        tuple: (records, rolled_back) where records is a list of
+               (run, file, hunks) in journal order and rolled_back the set of
+               runs already undone.
+    """
+    records = []
+    rolled_back = set()
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line_number, raw in enumerate(f, 1):
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+                if "rolled_back" in record:
+                    rolled_back.add(record["rolled_back"])
+                else:
+                    records.append((record["run"], record["file"], record["hunks"]))
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                print(f"Warning: Skipping malformed journal line {line_number} in '{journal_path}': {e}", file=sys.stderr)
+    return records, rolled_back
+
+def journal_runs(records, rolled_back):
+    """Returns [(run, file_count, hunk_count, rolled_back)] in journal order."""
+    runs = {}
+    for run, file_path, hunks in records:
+        files, hunk_count = runs.get(run, (set(), 0))
+        files.add(file_path)
+        runs[run] = (files, hunk_count + len(hunks))
+    return [(run, len(files), hunk_count, run in rolled_back) for run, (files, hunk_count) in runs.items()]
+
+def rollback_journal(journal_path, run=None, dry_run=False):
+    """
+    Undoes the edits of one run recorded in a journal (the newest run not yet
+    rolled back, by default; run="all" for every such run), with one read and
+    one write per file.
+
+    Runs are reverted newest-first. A hunk is only restored if the file still
+    contains exactly the lines that run wrote; otherwise it is reported and left
+    alone. Unless dry_run, the runs are then marked as rolled back.
+
+    Returns:
+        tuple: (restored_hunk_count, error_count, rolled_back_runs)
+    """
+    records, rolled_back = read_journal(journal_path)
+    pending = [run_id for run_id, _, _, done in journal_runs(records, rolled_back) if not done]
+    if run is None:
+        selected = pending[-1:]
+    elif run == "all":
+        selected = pending
+    elif run in rolled_back:
+        print(f"Error: Run '{run}' in '{journal_path}' was already rolled back.", file=sys.stderr)
+        return 0, 1, []
+    elif run in pending:
+        selected = [run]
+    else:
+        print(f"Error: No run '{run}' in '{journal_path}' (see --list-runs).", file=sys.stderr)
+        return 0, 1, []
+    if not selected:
+        print(f"Info: Nothing left to roll back in '{journal_path}'.", file=sys.stderr)
+        return 0, 0, []
+
+    selected_set = set(selected)
+    records_by_file = {}
+    for run_id, file_path, hunks in records:
+        if run_id in selected_set:
+            records_by_file.setdefault(file_path, []).append(hunks)
+
+    restored_count = 0
+    error_count = 0
+    for file_path, runs in records_by_file.items():
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                original = f.readlines()
+        except (IOError, UnicodeDecodeError) as e:
+            print(f"Error: Cannot read '{file_path}' for rollback: {e}. Skipping.", file=sys.stderr)
+            error_count += sum(len(hunks) for hunks in runs)
+            continue
+
+        lines = list(original)
+        file_restored = 0
+        for hunks in reversed(runs):
+            for hunk in sorted(hunks, key=lambda h: h["line"], reverse=True):
+                start_index = hunk["line"] - 1
+                end_index = start_index + len(hunk["new"])
+                if lines[start_index:end_index] != hunk["new"]:
+                    print(f"Error: Line {hunk['line']} in '{file_path}' changed since it was edited. Not restoring it.", file=sys.stderr)
+                    error_count += 1
+                    continue
+                lines[start_index:end_index] = hunk["old"]
+                file_restored += 1
+
+        if not file_restored:
+            continue
+        if dry_run:
+            display_path = file_path.lstrip("/")
+            sys.stdout.writelines(difflib.unified_diff(original, lines, f"a/{display_path}", f"b/{display_path}"))
         else:
-            print(f"Error: Line number {line_number} is out of range for file '{file_path}' (Total lines: {len(lines)}). Skipping.", file=sys.stderr)
-            return False
+            try:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.writelines(lines)
+            except IOError as e:
+                print(f"Error writing '{file_path}' during rollback: {e}. Skipping.", file=sys.stderr)
+                error_count += file_restored
+                continue
+        restored_count += file_restored
+        print(f"{'Would restore' if dry_run else 'Restored'} {file_restored} edit(s) in '{file_path}'", file=sys.stderr)
+
+    if not dry_run:
+        # Hunks that could not be restored were reported above; retrying them
+        # later would only repeat those errors next to already-restored lines.
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps({"rolled_back": run_id}) + "\n" for run_id in selected)
+    return restored_count, error_count, selected
 
+
+def edit_file(file_path, reports, fix_aliases=False, dry_run=False, journal=None):
+    """
+    Applies all reported edits for one file with a single read and a single write.
+
+    Args:
+        file_path (str): The path to the file to modify.
+        reports (list): (line_number, warning_text) tuples, 1-indexed line numbers.
+        fix_aliases (bool): Remove whole 'alias' constructs (or just the unused
+                            names of a group) via aliasFixer instead of
+                            commenting out the reported line.
+        dry_run (bool): Print a unified diff to stdout instead of writing the file.
+        journal (EditJournal, optional): Records the original lines once the file is written.
+
+    Returns:
+        tuple: (ok_count, error_count)
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found. Skipping.", file=sys.stderr)
-        return False
-    except IOError as e:
+        return 0, len(reports)
+    except (IOError, UnicodeDecodeError) as e:
         print(f"Error processing file '{file_path}': {e}. Skipping.", file=sys.stderr)
+        return 0, len(reports)
+    instrument.count("bytes_read", sum(len(line) for line in lines))
+
+    if fix_aliases:
+        alias_reports = [(line_number, alias_name_from_warning(warning)) for line_number, warning in reports]
+        hunks, problems = plan_alias_edits(lines, alias_reports)
+        for line_number, message in problems:
+            print(f"Error: {message} in '{file_path}' (reported line {line_number}). Skipping.", file=sys.stderr)
+        verb = "Would fix" if dry_run else "Successfully fixed"
+        for start_index, old_lines, _ in hunks:
+            print(f"{verb} alias at lines {start_index + 1}-{start_index + len(old_lines)} in '{file_path}'", file=sys.stderr)
+        error_count = len(problems)
+        ok_count = len(reports) - error_count
+    else:
+        hunks, ok_count, error_count = plan_prepend_edits(file_path, lines, [line_number for line_number, _ in reports], dry_run)
+
+    if hunks and dry_run:
+        sys.stdout.write(format_unified_diff(file_path, lines, hunks))
+    elif hunks:
+        try:
+            new_lines = apply_hunks(lines, hunks)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.writelines(new_lines)
+            instrument.count("files_touched")
+            instrument.count("edits_applied", len(hunks))
+            instrument.count("bytes_written", sum(len(line) for line in new_lines))
+        except IOError as e:
+            print(f"Error writing file '{file_path}': {e}. Skipping.", file=sys.stderr)
+            return 0, len(reports)
+        if journal is not None:
+            journal.record(file_path, hunks)
+    return ok_count, error_count
+
+
+def prepend_to_line_in_file(file_path, line_number_str):
+    """
+    Comments out a specific line in a file ('# ' or '// ', by extension).
+
+    Args:
+        file_path (str): The path to the file to modify.
+        line_number_str (str): The line number (1-indexed) as a string.
+
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    line_number = parse_line_number(file_path, line_number_str)
+    if line_number is None:
         return False
-    except Exception as e:
-        print(f"An unexpected error occurred while processing '{file_path}' at line {line_number}: {e}. Skipping.", file=sys.stderr)
-        return False
+    _, error_count = edit_file(file_path, [(line_number, None)])
+    return error_count == 0
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Parses JSON input (list of objects with 'fileWithPath' and 'lineNumber') "
-                    "and prepends '# ' to the specified lines in the files.",
+                    "and comments out the specified lines in the files: '# ' by default, "
+                    "'// ' for TypeScript/JavaScript, Rust and other C-style sources.",
         formatter_class=argparse.RawTextHelpFormatter
     )
 
@@ -84,8 +454,98 @@ def main():
              "If not specified, and no data is piped or provided via --text-input, "
              "the script will expect input from stdin."
     )
+    parser.add_argument(
+        "--fix-aliases",
+        action="store_true",
+        help="Treat entries as 'unused alias' warnings: comment out the whole (possibly\n"
+             "multi-line) alias construct, or drop only the unused names from an\n"
+             "'alias Prefix.{A, B}' group. Uses each entry's optional 'warning' text."
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print a unified diff of the edits to stdout without touching any file.\n"
+             "With --rollback, previews the rollback instead."
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="PATH",
+        help="Append the original contents of every edited line to this journal\n"
+             "(JSON lines). Defaults to a per-project journal (keyed by the enclosing\n"
+             f"git repository, else the current directory) under '{JOURNAL_DIR}'."
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Do not write a journal for this run."
+    )
+    parser.add_argument(
+        "--run-id",
+        metavar="ID",
+        help="Record this run's edits under ID instead of a fresh id, so edits from\n"
+             "several invocations (e.g. a fixWarnings.py session) roll back together."
+    )
+    parser.add_argument(
+        "--rollback",
+        nargs="?",
+        const="",
+        metavar="JOURNAL",
+        help="Undo the newest run recorded in JOURNAL (default: the --journal\n"
+             "journal) and exit. Rolled-back runs are marked, so repeating\n"
+             "--rollback undoes the run before."
+    )
+    parser.add_argument(
+        "--run",
+        metavar="ID",
+        help="With --rollback, undo this run instead of the newest ('all' for every\n"
+             "run not yet rolled back)."
+    )
+    parser.add_argument(
+        "--list-runs",
+        action="store_true",
+        help="List the runs recorded in the journal and exit."
+    )
+    instrument.add_arguments(parser)
 
     args = parser.parse_args()
+    instr = instrument.activate("prependComment", args)
+    journal_path = args.rollback or args.journal or default_journal_path()
+    if args.run is not None and args.rollback is None:
+        parser.error("--run only applies to --rollback")
+    if args.run_id == "all":
+        parser.error("--run-id 'all' is reserved for --rollback --run all")
+
+    if args.list_runs:
+        try:
+            records, rolled_back = read_journal(journal_path)
+        except FileNotFoundError:
+            print(f"No journal at '{journal_path}'.", file=sys.stderr)
+            sys.exit(0)
+        except IOError as e:
+            print(f"Error reading journal file '{journal_path}': {e}", file=sys.stderr)
+            sys.exit(1)
+        for run, file_count, hunk_count, done in journal_runs(records, rolled_back):
+            print(f"{run}  {hunk_count} edit(s) in {file_count} file(s){'  (rolled back)' if done else ''}")
+        sys.exit(0)
+
+    if args.rollback is not None:
+        try:
+            with instr.phase("rollback"):
+                restored_count, error_count, runs = rollback_journal(journal_path, run=args.run, dry_run=args.dry_run)
+        except FileNotFoundError:
+            print(f"Error: Journal file '{journal_path}' not found.", file=sys.stderr)
+            sys.exit(1)
+        except IOError as e:
+            print(f"Error reading journal file '{journal_path}': {e}", file=sys.stderr)
+            sys.exit(1)
+        if runs:
+            print(f"\n{'Would roll back' if args.dry_run else 'Rolled back'} run(s): {', '.join(runs)}", file=sys.stderr)
+        print(f"\nRollback complete. {'Would restore' if args.dry_run else 'Restored'} {restored_count} edit(s).", file=sys.stderr)
+        instr.finish()
+        if error_count > 0:
+            print(f"Encountered {error_count} errors or skipped edits. See messages above for details.", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
 
     json_input_str = None
     input_source_description = ""
@@ -123,7 +583,8 @@ def main():
         sys.exit(1)
         
     try:
-        data_to_process = json.loads(json_input_str)
+        with instr.phase("parse input"):
+            data_to_process = json.loads(json_input_str)
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON received from {input_source_description}: {e}", file=sys.stderr)
         sys.exit(1)
@@ -134,6 +595,8 @@ def main():
 
     modified_count = 0
     error_count = 0
+    # Group entries per file (keeping first-seen order) so each file is read and written once.
+    reports_by_file = {}
 
     for item in data_to_process:
         if not isinstance(item, dict):
@@ -148,13 +611,42 @@ def main():
             print(f"Warning: Skipping item due to missing 'fileWithPath' or 'lineNumber': {item}", file=sys.stderr)
             error_count +=1
             continue
-        
-        if prepend_to_line_in_file(file_path, line_number_str):
-            modified_count += 1
-        else:
+
+        line_number = parse_line_number(file_path, line_number_str)
+        if line_number is None:
             error_count += 1
+            continue
+        reports_by_file.setdefault(file_path, []).append((line_number, item.get("warning")))
+
+    journal = None
+    if not args.dry_run and not args.no_journal and reports_by_file:
+        try:
+            journal = EditJournal(journal_path, run_id=args.run_id)
+        except IOError as e:
+            print(f"Error: Cannot open journal file '{journal_path}': {e}", file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        with instr.phase("edit files"):
+            for file_path, reports in reports_by_file.items():
+                ok_count, file_error_count = edit_file(file_path, reports, fix_aliases=args.fix_aliases,
+                                                       dry_run=args.dry_run, journal=journal)
+                modified_count += ok_count
+                error_count += file_error_count
+    finally:
+        if journal is not None:
+            journal.close()
     
-    print(f"\nProcessing complete. Successfully modified lines in {modified_count} instances.", file=sys.stderr)
+    if args.dry_run:
+        print(f"\nDry run complete. Would modify lines in {modified_count} instances; no files were changed.", file=sys.stderr)
+    else:
+        print(f"\nProcessing complete. Successfully modified lines in {modified_count} instances.", file=sys.stderr)
+        if journal is not None:
+            journal_arg = f" {args.journal}" if args.journal else ""
+            print(f"Journal: '{journal_path}' (run {journal.run_id}). "
+                  f"Undo with: prependComment.py --rollback{journal_arg} --run {journal.run_id}", file=sys.stderr)
+    instr.count("warnings_received", len(data_to_process))
+    instr.finish()
     if error_count > 0:
         print(f"Encountered {error_count} errors or skipped items. See messages above for details.", file=sys.stderr)
         sys.exit(1) # Exit with error code if there were issues
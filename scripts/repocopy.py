@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
 
+import argparse
+import json
 import os
 import sys
 import subprocess
 import tempfile
+import threading
+import time
+
+# Output is streamed in chunks of this size, and buffered in memory only up to
+# SPOOL_MAX_SIZE before spilling to a temp file, so peak memory does not grow
+# with the size of the packed repo.
+COPY_CHUNK_SIZE = 1024 * 1024
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+CLIPBOARD_TIMEOUT = 5  # Seconds for the whole clipboard hand-off, writing included.
 
 # Define the options
 OPTIONS = [
@@ -15,9 +26,164 @@ OPTIONS = [
     ["lib", "test", "examples"]                        # Option 6
 ]
 
-def run_repomix_for_dirs(dirs):
-    """Run repomix for each directory and combine outputs"""
-    combined_content = ""
+# Options for other project types, picked by the marker files in the project
+# root (OPTIONS above is the Elixir set, and the fallback when nothing matches).
+PYTHON_OPTIONS = [["src"], ["src", "tests"], ["src", "tests", "examples"], ["tests"]]
+NODE_OPTIONS = [["src"], ["src", "test"], ["src", "tests"], ["lib"], ["lib", "test"]]
+RUST_OPTIONS = [["src"], ["src", "tests"], ["src", "tests", "examples"], ["benches"]]
+MARKER_OPTIONS = [
+    ("mix.exs", "elixir", OPTIONS),
+    ("pyproject.toml", "python", PYTHON_OPTIONS),
+    ("setup.py", "python", PYTHON_OPTIONS),
+    ("package.json", "node", NODE_OPTIONS),
+    ("Cargo.toml", "rust", RUST_OPTIONS),
+]
+
+# A project can define its own options instead, e.g.
+#   {"presets": [["lib", "test"], ["apps/web/lib", "apps/core/lib"]]}
+CONFIG_FILENAME = ".repocopy.json"
+CACHE_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                          "repocopy", "presets.json")
+
+def load_config_presets(config_path):
+    """Returns the preset list from a .repocopy.json, or None (with a warning) if it is unusable"""
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            presets = json.load(f).get("presets")
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Warning: Ignoring unreadable {CONFIG_FILENAME}: {e}")
+        return None
+    if (not isinstance(presets, list) or not presets
+            or not all(isinstance(dirs, list) and dirs and all(isinstance(d, str) for d in dirs) for dirs in presets)):
+        print(f"Warning: Ignoring {CONFIG_FILENAME}: 'presets' must be a non-empty list of directory lists")
+        return None
+    return presets
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def detect_presets(root):
+    """
+    Works out the options for `root` from a single scandir of it: the
+    project's .repocopy.json if present, else the options for each marker file
+    found (mix.exs, pyproject.toml, package.json, ...), else OPTIONS.
+
+    Each option keeps its number (so `repocopy.py 5` stays stable) but only the
+    directories that exist; options with none left are dropped, so no repomix
+    run is wasted on them.
+
+    Returns:
+        dict: {"source": str, "presets": [[number, dirs], ...],
+               "stamps": {path: mtime_ns}} where the stamps are the directories
+              (and config file) whose changes invalidate the result.
+    """
+    # Stamped before the scan, so a change during it invalidates the result.
+    stamps = {root: _mtime_ns(root)}
+    top_dirs = set()
+    top_files = set()
+    with os.scandir(root) as it:
+        for entry in it:
+            try:
+                (top_dirs if entry.is_dir() else top_files).add(entry.name)
+            except OSError:
+                continue
+
+    config_path = os.path.join(root, CONFIG_FILENAME)
+    candidates = None
+    if CONFIG_FILENAME in top_files:
+        stamps[config_path] = _mtime_ns(config_path)
+        candidates = load_config_presets(config_path)
+        source = CONFIG_FILENAME
+    if candidates is None:
+        found = [(marker, kind, options) for marker, kind, options in MARKER_OPTIONS if marker in top_files]
+        candidates = []
+        kinds = []
+        for _, kind, options in found:
+            if kind not in kinds:
+                kinds.append(kind)
+                candidates.extend(options)
+        if not candidates:
+            candidates = OPTIONS
+        source = ", ".join(f"{marker} ({kind})" for marker, kind, _ in found) or "defaults"
+
+    presets = []
+    for number, dirs in enumerate(candidates, 1):
+        existing = []
+        for dir_name in dirs:
+            dir_name = dir_name.strip("/")
+            top, _, rest = dir_name.partition("/")
+            if top not in top_dirs:
+                continue
+            if rest:
+                parent = os.path.join(root, os.path.dirname(dir_name))
+                stamps[parent] = _mtime_ns(parent)
+                if not os.path.isdir(os.path.join(root, dir_name)):
+                    continue
+            existing.append(dir_name)
+        if existing:
+            presets.append([number, existing])
+    return {"source": source, "presets": presets, "stamps": stamps}
+
+def resolve_presets(root, use_cache=True):
+    """
+    detect_presets(root), cached per repo in CACHE_PATH. A cached result is
+    reused while the mtimes of the root, the config file and the parents of
+    nested preset directories are unchanged.
+    """
+    root = os.path.abspath(root)
+    cache = {}
+    if use_cache:
+        try:
+            with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        # A malformed or old-schema entry counts as a miss and is overwritten below.
+        try:
+            cached = cache.get(root)
+            if (cached and isinstance(cached["source"], str) and isinstance(cached["presets"], list)
+                    and all(_mtime_ns(path) == mtime for path, mtime in cached["stamps"].items())):
+                return cached
+        except (KeyError, TypeError, ValueError, AttributeError):
+            pass
+
+    result = detect_presets(root)
+    if use_cache:
+        cache[root] = result
+        try:
+            os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+            tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, CACHE_PATH)
+        except OSError as e:
+            print(f"Warning: Could not write preset cache '{CACHE_PATH}': {e}")
+    return result
+
+def copy_chunks(source, destination):
+    """Copies a binary stream in COPY_CHUNK_SIZE pieces. Returns the number of bytes copied."""
+    copied = 0
+    while True:
+        chunk = source.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            return copied
+        destination.write(chunk)
+        copied += len(chunk)
+
+def run_repomix_for_dirs(dirs, sink):
+    """
+    Run repomix for each directory and stream the outputs, each under a
+    '# === ./dir/ ===' header, into the binary file object `sink`.
+
+    Returns:
+        int: The number of bytes written to `sink`.
+    """
+    written = 0
     original_cwd = os.getcwd()
     
     for dir_name in dirs:
@@ -46,14 +212,15 @@ def run_repomix_for_dirs(dirs):
                     break
             
             if repomix_file:
-                # Read the content
+                # Copy the content across without reading it into memory
                 print(f"  Found output file: {repomix_file}")
-                with open(repomix_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if combined_content:
-                    combined_content += f"\n\n# === ./{dir_name}/ ===\n\n{content}"
-                else:
-                    combined_content = f"# === ./{dir_name}/ ===\n\n{content}"
+                header = f"# === ./{dir_name}/ ===\n\n"
+                if written:
+                    header = "\n\n" + header
+                with open(repomix_file, 'rb') as f:
+                    sink.write(header.encode())
+                    written += len(header.encode())
+                    written += copy_chunks(f, sink)
                 
                 # Remove the file
                 os.remove(repomix_file)
@@ -73,36 +240,47 @@ def run_repomix_for_dirs(dirs):
         # Change back to original directory
         os.chdir(original_cwd)
     
-    return combined_content
+    return written
+
+def _feed_stdin(source, process):
+    """Writer thread body: streams `source` into the process's stdin and closes it."""
+    try:
+        copy_chunks(source, process.stdin)
+        process.stdin.close()
+    except (BrokenPipeError, ValueError, OSError):
+        pass  # The tool exited early or was killed; its exit code and stderr say why.
 
-def send_to_clipboard(content):
-    """Send content to clipboard"""
+def send_to_clipboard(source):
+    """Send the binary stream `source` (read from its start) to the clipboard in chunks"""
     try:
         # Check if we're in WSL
         is_wsl = subprocess.run(['uname', '-r'], capture_output=True, text=True).stdout.lower().find('microsoft') != -1
         
-        if is_wsl:
-            # Use clip.exe for WSL
-            process = subprocess.Popen(['clip.exe'], 
+        # Use clip.exe for WSL, xclip for native Linux
+        command = ['clip.exe'] if is_wsl else ['xclip', '-selection', 'clipboard']
+        # stderr goes to a file rather than a pipe: xclip stays in the background
+        # to own the selection and would hold a pipe open.
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(command, 
                                        stdin=subprocess.PIPE, 
-                                       stdout=subprocess.PIPE, 
-                                       stderr=subprocess.PIPE)
-            stdout, stderr = process.communicate(input=content.encode(), timeout=5)
+                                       stdout=subprocess.DEVNULL, 
+                                       stderr=stderr_file)
+            source.seek(0)
+            # The write happens in a thread so a tool that stops reading cannot
+            # block us past the deadline.
+            deadline = time.monotonic() + CLIPBOARD_TIMEOUT
+            writer = threading.Thread(target=_feed_stdin, args=(source, process), daemon=True)
+            writer.start()
+            writer.join(CLIPBOARD_TIMEOUT)
+            if writer.is_alive():
+                process.kill()
+                writer.join(1)
+                raise subprocess.TimeoutExpired(command, CLIPBOARD_TIMEOUT)
+            process.wait(timeout=max(0.0, deadline - time.monotonic()))
             
             if process.returncode != 0:
-                print(f"Error copying to clipboard: {stderr.decode()}")
-                return False
-            return True
-        else:
-            # Use xclip for native Linux
-            process = subprocess.Popen(['xclip', '-selection', 'clipboard'], 
-                                       stdin=subprocess.PIPE, 
-                                       stdout=subprocess.PIPE, 
-                                       stderr=subprocess.PIPE)
-            stdout, stderr = process.communicate(input=content.encode(), timeout=5)
-            
-            if process.returncode != 0:
-                print(f"Error copying to clipboard: {stderr.decode()}")
+                stderr_file.seek(0)
+                print(f"Error copying to clipboard: {stderr_file.read().decode(errors='replace')}")
                 return False
             return True
     except subprocess.TimeoutExpired:
@@ -110,9 +288,9 @@ def send_to_clipboard(content):
         print("Timeout: Clipboard operation took too long")
         # Save to temp file as fallback
         try:
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-                f.write(content)
+            with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+                source.seek(0)
+                copy_chunks(source, f)
                 temp_path = f.name
             print(f"Content saved to temporary file: {temp_path}")
             print(f"You can copy it manually with: cat {temp_path} | copy")
@@ -124,24 +302,14 @@ def send_to_clipboard(content):
         print(f"Error copying to clipboard: {e}")
         return False
 
-def main():
-    # Check if an argument was provided
-    if len(sys.argv) > 1:
-        try:
-            option_num = int(sys.argv[1])
-            if 1 <= option_num <= len(OPTIONS):
-                selected_dirs = OPTIONS[option_num - 1]
-            else:
-                print(f"Error: Option must be between 1 and {len(OPTIONS)}")
-                sys.exit(1)
-        except ValueError:
-            print("Error: Argument must be a number")
-            sys.exit(1)
-    else:
+def select_option(presets, option):
+    """Returns the directories for an option number, prompting if `option` is None"""
+    by_number = dict((number, dirs) for number, dirs in presets)
+    if option is None:
         # Interactive mode
         print("Select an option:")
-        for i, option in enumerate(OPTIONS, 1):
-            print(f"{i}. {', '.join(option)}")
+        for number, dirs in presets:
+            print(f"{number}. {', '.join(dirs)}")
         
         try:
             choice = input("\nEnter option number: ")
@@ -149,36 +317,94 @@ def main():
             if not choice:
                 print("\nNo input provided")
                 sys.exit(1)
-            option_num = int(choice)
-            if 1 <= option_num <= len(OPTIONS):
-                selected_dirs = OPTIONS[option_num - 1]
-            else:
-                print(f"Error: Option must be between 1 and {len(OPTIONS)}")
-                sys.exit(1)
-        except ValueError as e:
+            option = int(choice)
+        except ValueError:
             print(f"\nInvalid input: '{choice}' is not a valid number")
             sys.exit(1)
         except KeyboardInterrupt:
             print("\nCancelled by user")
             sys.exit(1)
+
+    if option not in by_number:
+        available = ", ".join(str(number) for number in by_number)
+        print(f"Error: Option {option} is not available here (available: {available})")
+        sys.exit(1)
+    return by_number[option]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Runs repomix in each directory of an option and copies the combined output to the clipboard. "
+                    f"Options come from {CONFIG_FILENAME} in the current directory if present, "
+                    "else from the project type (mix.exs, pyproject.toml, package.json, Cargo.toml)."
+    )
+    parser.add_argument(
+        "option",
+        nargs="?",
+        type=int,
+        help="Option number (see --list). Prompts if omitted."
+    )
+    parser.add_argument(
+        "--out",
+        metavar="PATH",
+        help="Write the combined output to PATH instead of the clipboard."
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List the options available in this directory and exit."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-detect options instead of using the cache in '{CACHE_PATH}'."
+    )
+    args = parser.parse_args()
+
+    detected = resolve_presets(os.getcwd(), use_cache=not args.no_cache)
+    presets = detected["presets"]
+    if not presets:
+        print(f"Error: None of the option directories exist here (options from {detected['source']}). "
+              f"Add a {CONFIG_FILENAME} with your own presets.")
+        sys.exit(1)
+    if args.list:
+        print(f"Options from {detected['source']}:")
+        for number, dirs in presets:
+            print(f"{number}. {', '.join(dirs)}")
+        return
+    selected_dirs = select_option(presets, args.option)
     
-    # Run repomix for selected directories
+    # Run repomix for selected directories, streaming straight into the
+    # output file or into a spooled buffer for the clipboard
     print(f"\nProcessing directories: {', '.join(selected_dirs)}")
-    combined_content = run_repomix_for_dirs(selected_dirs)
-    
-    if combined_content:
-        # Show content size
-        content_size = len(combined_content)
-        print(f"\nTotal content size: {content_size:,} characters")
-        
-        # Send to clipboard
-        print("Copying to clipboard...")
-        if send_to_clipboard(combined_content):
-            print("Content copied to clipboard!")
+    if args.out:
+        out_path = os.path.abspath(args.out)
+        try:
+            with open(out_path, 'wb') as sink:
+                content_size = run_repomix_for_dirs(selected_dirs, sink)
+        except OSError as e:
+            print(f"Error writing '{out_path}': {e}")
+            sys.exit(1)
+        if content_size:
+            print(f"\nWrote {content_size:,} bytes to {out_path}")
+        else:
+            os.remove(out_path)
+            print("\nNo content to write")
+        return
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as buffer:
+        content_size = run_repomix_for_dirs(selected_dirs, buffer)
+        if content_size:
+            # Show content size
+            print(f"\nTotal content size: {content_size:,} bytes")
+            
+            # Send to clipboard
+            print("Copying to clipboard...")
+            if send_to_clipboard(buffer):
+                print("Content copied to clipboard!")
+            else:
+                print("Failed to copy to clipboard")
         else:
-            print("Failed to copy to clipboard")
-    else:
-        print("\nNo content to copy")
+            print("\nNo content to copy")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
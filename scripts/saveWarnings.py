@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 
+import argparse
 import subprocess
 import os
 import sys
 
+import instrument
+
 # --- Configuration ---
 DEFAULT_OUTPUT_FILENAME = "my_warnings.txt" # It can still save to a file if desired
 # --- End Configuration ---
 
-def run_mix_compile_and_handle_output(output_file_path_for_saving=None):
+def run_mix_compile_and_handle_output(output_file_path_for_saving=None, extra_args=None):
     """
     Runs 'mix compile', prints its combined stdout/stderr to THIS script's stdout,
     and optionally saves it to a file.
@@ -16,23 +19,25 @@ def run_mix_compile_and_handle_output(output_file_path_for_saving=None):
     Args:
         output_file_path_for_saving (str, optional): Path to save the output.
                                                      If None, only prints to stdout.
+        extra_args (list, optional): Extra arguments for 'mix compile' (e.g. ['--force']).
 
     Returns:
         int: The return code of the 'mix compile' process.
              Returns a negative number if the script itself had an error
              before or during running 'mix compile'.
     """
-    command = ["mix", "compile"]
+    command = ["mix", "compile"] + (extra_args or [])
     # Informative message to stderr for the direct user of saveWarnings.py
     print(f"saveWarnings.py: Running command: {' '.join(command)}", file=sys.stderr)
 
     try:
-        process = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=False # We handle the return code
-        )
+        with instrument.phase("mix compile"):
+            process = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                check=False # We handle the return code
+            )
 
         combined_output = ""
         if process.stdout:
@@ -46,6 +51,7 @@ def run_mix_compile_and_handle_output(output_file_path_for_saving=None):
         # --- CRITICAL CHANGE: Print combined_output to this script's stdout ---
         sys.stdout.write(combined_output)
         # --- END CRITICAL CHANGE ---
+        instrument.count("bytes_read", len(combined_output))
 
         # Optional: Still print to stderr for direct user feedback
         print(f"\nsaveWarnings.py: --- 'mix compile' Output (also sent to stdout) ---", file=sys.stderr)
@@ -58,8 +64,9 @@ def run_mix_compile_and_handle_output(output_file_path_for_saving=None):
         # Optional: Still save to a file
         if output_file_path_for_saving:
             try:
-                with open(output_file_path_for_saving, 'w', encoding='utf-8') as f:
+                with open(output_file_path_for_saving, 'w', encoding='utf-8') as f, instrument.phase("save output"):
                     f.write(combined_output)
+                instrument.count("bytes_written", len(combined_output))
                 print(f"saveWarnings.py: Successfully saved 'mix compile' output to '{output_file_path_for_saving}'", file=sys.stderr)
             except IOError as e:
                 print(f"saveWarnings.py: Error saving output to file '{output_file_path_for_saving}': {e}", file=sys.stderr)
@@ -80,6 +87,19 @@ def run_mix_compile_and_handle_output(output_file_path_for_saving=None):
         return -2 # Indicate script's own error
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Runs 'mix compile', echoes its output to stdout and saves it to "
+                    f"'{DEFAULT_OUTPUT_FILENAME}'."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Pass --force to 'mix compile' so every module is recompiled and all warnings are reported."
+    )
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+    instr = instrument.activate("saveWarnings", args)
+
     pwd = os.getcwd()
     # Decide if you want saveWarnings.py to always save a file, or only print to stdout
     # For fixWarnings.py, we only *need* stdout. Saving the file here is optional.
@@ -88,7 +108,11 @@ def main():
     # Pass the file path if you want it to save, or None if only stdout is needed by default
     # For clarity, let's make it always attempt to save the file as it did before,
     # but the crucial part is that it *also* prints to stdout.
-    exit_code = run_mix_compile_and_handle_output(output_file_path_for_saving=default_file_to_save)
+    exit_code = run_mix_compile_and_handle_output(
+        output_file_path_for_saving=default_file_to_save,
+        extra_args=["--force"] if args.force else None
+    )
+    instr.finish()
     
     sys.exit(exit_code if exit_code >= 0 else 1) # exit with mix compile's code, or 1 for script error
 
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+
+"""
+Syncs forks with their upstreams, many repos at a time.
+
+For every repo that has an `upstream` remote it fetches upstream, finds the
+upstream default branch, merges it into the local branch of the same name
+and optionally pushes to `origin`. Repos run in a bounded worker pool and a
+summary table is printed at the end:
+
+    syncForks.py                       # scan the default roots
+    syncForks.py ~/p/g/n --push        # scan one root, push merged branches
+    syncForks.py . --dry-run           # just report how far behind this repo is
+    syncForks.py --config forks.json   # explicit repo list
+
+PATHs that are git repos are synced directly; other directories are scanned
+one level deep for repos with an upstream remote. The config file is JSON:
+
+    {"repos": ["~/p/g/n/foo", {"path": "~/p/g/n/bar", "branch": "develop"}],
+     "roots": ["~/p/g/v"]}
+
+A merge that conflicts is aborted so the repo is left as it was, and repos
+with uncommitted changes are skipped.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+# --- Configuration ---
+# The project directories aliased in .bash/bash_aliases (n, g, v, r).
+DEFAULT_SCAN_ROOTS = ["~/p/g/n", "~/p/g/g", "~/p/g/v", "~/p/n/r"]
+DEFAULT_CONFIG_PATH = "~/.config/syncForks.json"
+UPSTREAM_REMOTE = "upstream"
+ORIGIN_REMOTE = "origin"
+DEFAULT_JOBS = 8
+DEFAULT_GIT_TIMEOUT = 300  # seconds per git command
+# --- End Configuration ---
+
+# Failed outcomes sort first in the summary, and make the exit code non-zero.
+STATUS_ORDER = ["error", "conflicted", "dirty", "merged", "behind", "up-to-date"]
+FAILED_STATUSES = {"error", "conflicted"}
+REMOTE_SECTION_PATTERN = re.compile(r'^\s*\[remote\s+"([^"]+)"\]', re.MULTILINE)
+GIT_ENV = dict(os.environ, GIT_TERMINAL_PROMPT="0", GIT_MERGE_AUTOEDIT="no", LC_ALL="C")
+
+
+class GitError(Exception):
+    """A git command failed; the message is its (last line of) stderr."""
+
+
+def git(repo, *args, timeout=DEFAULT_GIT_TIMEOUT, check=True):
+    """Runs `git -C repo args...` and returns its stripped stdout."""
+    try:
+        result = subprocess.run(["git", "-C", repo, *args], capture_output=True, text=True,
+                                env=GIT_ENV, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise GitError(f"'git {args[0]}' timed out after {timeout}s")
+    if check and result.returncode != 0:
+        message = (result.stderr.strip() or result.stdout.strip() or f"exit code {result.returncode}")
+        raise GitError(f"'git {args[0]}' failed: {message.splitlines()[-1]}")
+    return result.stdout.strip()
+
+
+def remote_names(repo):
+    """Returns the repo's remote names, read from .git/config without spawning git when possible."""
+    config_path = os.path.join(repo, ".git", "config")
+    if os.path.isfile(config_path):
+        try:
+            with open(config_path, "r", encoding="utf-8", errors="replace") as f:
+                return set(REMOTE_SECTION_PATTERN.findall(f.read()))
+        except OSError:
+            pass
+    try:
+        return set(git(repo, "remote", timeout=30).split())
+    except GitError:
+        return set()
+
+
+def is_repo(path):
+    return os.path.exists(os.path.join(path, ".git"))
+
+
+def discover_repos(paths):
+    """
+    Expands PATHs into fork repos: repos are taken as-is, directories are
+    scanned one level deep for repos with an upstream remote.
+
+    Returns:
+        list: Absolute repo paths, sorted and de-duplicated.
+    """
+    repos = set()
+    for path in paths:
+        path = os.path.abspath(os.path.expanduser(path))
+        if is_repo(path):
+            repos.add(path)
+            continue
+        try:
+            with os.scandir(path) as it:
+                children = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+        except OSError as e:
+            print(f"Warning: Cannot scan '{path}': {e}. Skipping.", file=sys.stderr)
+            continue
+        for child in children:
+            if is_repo(child) and UPSTREAM_REMOTE in remote_names(child):
+                repos.add(child)
+    return sorted(repos)
+
+
+def load_config(config_path):
+    """
+    Reads a syncForks JSON config.
+
+    Returns:
+        tuple: (repo_paths, branch_overrides, scan_roots)
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    repos = []
+    branches = {}
+    for item in config.get("repos", []):
+        if isinstance(item, str):
+            item = {"path": item}
+        path = os.path.abspath(os.path.expanduser(item["path"]))
+        repos.append(path)
+        if item.get("branch"):
+            branches[path] = item["branch"]
+    return repos, branches, config.get("roots", [])
+
+
+def upstream_default_branch(repo, timeout):
+    """Finds upstream's default branch: its remote HEAD if known, else main/master."""
+    head = git(repo, "symbolic-ref", "--quiet", "--short", f"refs/remotes/{UPSTREAM_REMOTE}/HEAD",
+               check=False, timeout=timeout)
+    if head.startswith(f"{UPSTREAM_REMOTE}/"):
+        return head[len(UPSTREAM_REMOTE) + 1:]
+    # Fetching does not set the remote HEAD, so ask the remote.
+    symref = git(repo, "ls-remote", "--symref", UPSTREAM_REMOTE, "HEAD", check=False, timeout=timeout)
+    match = re.match(r"ref: refs/heads/(\S+)\s+HEAD", symref)
+    if match:
+        return match.group(1)
+    for candidate in ("main", "master"):
+        if git(repo, "rev-parse", "--verify", "--quiet", f"refs/remotes/{UPSTREAM_REMOTE}/{candidate}",
+               check=False, timeout=timeout):
+            return candidate
+    raise GitError(f"Cannot determine the default branch of '{UPSTREAM_REMOTE}'")
+
+
+def merge_upstream(repo, branch, target, has_local, timeout, result):
+    """Checks out `branch` and merges `target` into it, aborting on conflict. Returns True if merged."""
+    original = git(repo, "symbolic-ref", "--quiet", "--short", "HEAD", check=False, timeout=timeout)
+    # On a detached HEAD there is no branch to go back to, so remember the commit.
+    detached = "" if original else git(repo, "rev-parse", "--verify", "HEAD", timeout=timeout)
+    if not has_local:
+        git(repo, "branch", "--quiet", "--track", branch, target, timeout=timeout)
+        result["detail"] = f"created from {target}"
+        return True
+    if original != branch:
+        git(repo, "checkout", "--quiet", branch, timeout=timeout)
+    try:
+        try:
+            merge = subprocess.run(["git", "-C", repo, "merge", "--no-edit", "--quiet", target],
+                                   capture_output=True, text=True, env=GIT_ENV, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            git(repo, "merge", "--abort", check=False, timeout=timeout)
+            raise GitError(f"'git merge' timed out after {timeout}s; merge aborted")
+        if merge.returncode == 0:
+            return True
+        git(repo, "merge", "--abort", check=False, timeout=timeout)
+        conflicts = [line for line in merge.stdout.splitlines() if line.startswith("CONFLICT")]
+        if not conflicts:
+            raise GitError(f"'git merge' failed: {(merge.stderr.strip() or 'unknown error').splitlines()[-1]}")
+        result["status"] = "conflicted"
+        result["detail"] = f"{len(conflicts)} conflict(s); merge aborted"
+        return False
+    finally:
+        if detached:
+            git(repo, "checkout", "--quiet", "--detach", detached, check=False, timeout=timeout)
+        elif original != branch:
+            git(repo, "checkout", "--quiet", original, check=False, timeout=timeout)
+
+
+def sync_repo(repo, branch=None, push=False, dry_run=False, timeout=DEFAULT_GIT_TIMEOUT):
+    """
+    Fetches upstream and merges its default branch (or `branch`) into the
+    local branch of the same name, restoring the originally checked-out
+    branch (or detached commit) afterwards. With `push`, the branch is pushed to origin whenever
+    origin is behind it.
+
+    Returns:
+        dict: {"repo", "branch", "status", "commits", "pushed", "detail", "seconds"}
+              where status is one of STATUS_ORDER.
+    """
+    start = time.perf_counter()
+    result = {"repo": repo, "branch": branch, "status": "error", "commits": 0, "pushed": False, "detail": ""}
+    try:
+        git(repo, "fetch", "--quiet", "--prune", UPSTREAM_REMOTE, timeout=timeout)
+        branch = result["branch"] = branch or upstream_default_branch(repo, timeout)
+        target = f"{UPSTREAM_REMOTE}/{branch}"
+        if not git(repo, "rev-parse", "--verify", "--quiet", f"refs/remotes/{target}", check=False, timeout=timeout):
+            raise GitError(f"'{target}' does not exist")
+
+        has_local = bool(git(repo, "rev-parse", "--verify", "--quiet", f"refs/heads/{branch}",
+                             check=False, timeout=timeout))
+        behind = int(git(repo, "rev-list", "--count", f"{branch if has_local else target}..{target}", timeout=timeout))
+        result["commits"] = behind
+        if has_local and behind == 0:
+            result["status"] = "up-to-date"
+        elif dry_run:
+            result["status"] = "behind"
+            result["detail"] = f"{behind} commit(s) to merge" if has_local else "no local branch yet"
+            return result
+        elif git(repo, "status", "--porcelain", "--untracked-files=no", timeout=timeout):
+            result["status"] = "dirty"
+            result["detail"] = "uncommitted changes; skipped"
+            return result
+        elif merge_upstream(repo, branch, target, has_local, timeout, result):
+            result["status"] = "merged"
+        else:
+            return result
+
+        if push and not dry_run:
+            origin_ref = f"refs/remotes/{ORIGIN_REMOTE}/{branch}"
+            origin_known = git(repo, "rev-parse", "--verify", "--quiet", origin_ref, check=False, timeout=timeout)
+            if not origin_known or int(git(repo, "rev-list", "--count", f"{origin_ref}..{branch}", timeout=timeout)):
+                try:
+                    git(repo, "push", "--quiet", ORIGIN_REMOTE, f"{branch}:{branch}", timeout=timeout)
+                    result["pushed"] = True
+                except GitError as e:
+                    result["detail"] = str(e)
+    except GitError as e:
+        result["status"] = "error"
+        result["detail"] = str(e)
+    finally:
+        result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def display_path(path):
+    home = os.path.expanduser("~")
+    return "~" + path[len(home):] if path == home or path.startswith(home + os.sep) else path
+
+
+def print_summary(results, total_seconds):
+    results = sorted(results, key=lambda r: (STATUS_ORDER.index(r["status"]), r["repo"]))
+    rows = [(display_path(r["repo"]), r["branch"] or "?", r["status"] + (" +pushed" if r["pushed"] else ""),
+             str(r["commits"]) if r["commits"] else "", f"{r['seconds']:.1f}s", r["detail"]) for r in results]
+    headers = ("REPO", "BRANCH", "STATUS", "COMMITS", "TIME", "DETAIL")
+    widths = [max(len(row[i]) for row in rows + [headers]) for i in range(len(headers) - 1)]
+    for row in [headers] + rows:
+        print("  ".join(cell.ljust(widths[i]) if i < len(widths) else cell for i, cell in enumerate(row)).rstrip())
+
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    summary = ", ".join(f"{counts[status]} {status}" for status in STATUS_ORDER if status in counts)
+    print(f"\n{len(results)} repo(s) in {total_seconds:.1f}s: {summary}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetches and merges upstream's default branch into many fork repos in parallel.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Repos to sync, or directories to scan for fork repos.\n"
+             f"Defaults to the config file's repos/roots, else {', '.join(DEFAULT_SCAN_ROOTS)}."
+    )
+    parser.add_argument("--config", help=f"JSON config with 'repos' and/or 'roots'. Defaults to {DEFAULT_CONFIG_PATH} if present.")
+    parser.add_argument("--branch", help="Branch to sync instead of each upstream's default branch.")
+    parser.add_argument("--push", action="store_true", help=f"Push merged branches to '{ORIGIN_REMOTE}'.")
+    parser.add_argument("--dry-run", action="store_true", help="Fetch only and report how far behind each repo is.")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help=f"Repos synced in parallel. Defaults to {DEFAULT_JOBS}.")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_GIT_TIMEOUT,
+                        help=f"Seconds allowed per git command. Defaults to {DEFAULT_GIT_TIMEOUT}.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a table.")
+    args = parser.parse_args()
+
+    branches = {}
+    paths = args.paths
+    if not paths:
+        config_path = args.config or os.path.expanduser(DEFAULT_CONFIG_PATH)
+        if args.config or os.path.isfile(config_path):
+            try:
+                config_repos, branches, roots = load_config(config_path)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                print(f"Error: Cannot read config '{config_path}': {e}", file=sys.stderr)
+                sys.exit(1)
+            paths = config_repos + roots
+        else:
+            paths = DEFAULT_SCAN_ROOTS
+
+    repos = discover_repos(paths)
+    if not repos:
+        print("No fork repos found (repos need an 'upstream' remote).", file=sys.stderr)
+        sys.exit(1)
+    print(f"Syncing {len(repos)} repo(s) with {min(args.jobs, len(repos))} worker(s)...", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(sync_repo, repo, args.branch or branches.get(repo), args.push, args.dry_run, args.timeout)
+                   for repo in repos]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            print(f"  {result['status']:<11} {display_path(result['repo'])}", file=sys.stderr)
+            results.append(result)
+    total_seconds = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(sorted(results, key=lambda r: r["repo"]), indent=2))
+    else:
+        print()
+        print_summary(results, total_seconds)
+    sys.exit(1 if any(r["status"] in FAILED_STATUSES for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
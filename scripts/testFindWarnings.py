@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+"""
+Checks for findWarningsByPrefix.py's format sniffing and parser backends, and
+prependComment.py's comment prefixes, on small hand-written compiler logs:
+
+    testFindWarnings.py            # or: python3 -m unittest testFindWarnings
+    testFindWarnings.py -v
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+import findWarningsByPrefix
+from prependComment import comment_prefix_for
+
+# --- Configuration ---
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIND_WARNINGS_SCRIPT = os.path.join(SCRIPTS_DIR, "findWarningsByPrefix.py")
+# --- End Configuration ---
+
+ELIXIR_ALIAS_BLOCK = """\
+    warning: unused alias Bar
+    │
+  3 │   alias Foo.Bar
+    │   ~
+    │
+    └─ lib/foo.ex:3:3: Foo (module)
+
+"""
+
+# A mix log where dependency output in other formats comes before the first
+# Elixir warning block.
+MIXED_MIX_LOG = """\
+==> telemetry
+Compiling 1 file (.erl)
+src/telemetry.erl:12:5: Warning: variable 'X' is unused
+c_src/nif.c:10:5: warning: unused variable 'y' [-Wunused-variable]
+==> my_app
+Compiling 2 files (.ex)
+""" + ELIXIR_ALIAS_BLOCK
+
+RUFF_LOG = """\
+app/x.py:3:8: F401 [*] `os` imported but unused
+app/y.py:10:1: E402 Module level import not at top of file
+Found 2 errors.
+"""
+
+PYFLAKES_LOG = "app/z.py:4: 'sys' imported but unused\n"
+
+TSC_LOG = """\
+src/a.ts(12,5): error TS2304: Cannot find name 'x'.
+src/b.ts:3:7 - error TS6133: 'y' is declared but its value is never read.
+"""
+
+RUST_LOG = """\
+warning: unused variable: `x`
+ --> src/main.rs:2:9
+  |
+2 |     let x = 1;
+  |         ^ help: if this is intentional, prefix it with an underscore: `_x`
+
+error[E0425]: cannot find value `z` in this scope
+  --> src/lib.rs:14:5
+   |
+warning: `demo` (bin "demo") generated 1 warning
+"""
+
+
+def sniff(text):
+    return findWarningsByPrefix.sniff_format(text.splitlines(keepends=True))[0]
+
+
+def parse(text, output_format="auto", match="."):
+    _, results = findWarningsByPrefix.parse_lines(
+        text.splitlines(keepends=True), output_format,
+        re.compile(rf"^\s*warning: .*?(?:{match})"), re.compile(match))
+    return [(entry["fileWithPath"], entry["lineNumber"]) for entry in results]
+
+
+def run_script(text, *args):
+    result = subprocess.run([sys.executable, FIND_WARNINGS_SCRIPT, *args], input=text,
+                            capture_output=True, text=True)
+    return result.returncode, result.stdout, result.stderr
+
+
+class SniffTest(unittest.TestCase):
+
+    def test_plain_formats(self):
+        self.assertEqual(sniff(ELIXIR_ALIAS_BLOCK), "elixir")
+        self.assertEqual(sniff(RUFF_LOG), "ruff")
+        self.assertEqual(sniff(PYFLAKES_LOG), "ruff")
+        self.assertEqual(sniff(TSC_LOG), "tsc")
+        self.assertEqual(sniff(RUST_LOG), "rust")
+
+    def test_mix_log_with_dependency_diagnostics_is_elixir(self):
+        self.assertEqual(sniff(MIXED_MIX_LOG), "elixir")
+        self.assertEqual(sniff("** (CompileError) lib/x.ex:12: undefined function foo/0\n" + ELIXIR_ALIAS_BLOCK),
+                         "elixir")
+
+    def test_bare_elixir_warning_line_is_elixir(self):
+        self.assertEqual(sniff("src/telemetry.erl:12:5: Warning: x\nwarning: unused alias Bar\n"), "elixir")
+
+    def test_empty_input_defaults_to_elixir(self):
+        self.assertEqual(sniff(""), "elixir")
+
+    def test_sniffed_lines_are_still_parsed(self):
+        self.assertEqual(parse(RUFF_LOG), [("app/x.py", "3"), ("app/y.py", "10")])
+
+
+class BackendTest(unittest.TestCase):
+
+    def test_ruff_and_pyflakes(self):
+        self.assertEqual(parse(RUFF_LOG, match="F401"), [("app/x.py", "3")])
+        self.assertEqual(parse(PYFLAKES_LOG), [("app/z.py", "4")])
+
+    def test_tsc_both_layouts(self):
+        self.assertEqual(parse(TSC_LOG), [("src/a.ts", "12"), ("src/b.ts", "3")])
+
+    def test_rust_pairs_header_with_location(self):
+        self.assertEqual(parse(RUST_LOG), [("src/main.rs", "2"), ("src/lib.rs", "14")])
+        self.assertEqual(parse(RUST_LOG, match="unused"), [("src/main.rs", "2")])
+
+    def test_ansi_colours_are_ignored(self):
+        coloured = "\x1b[1m\x1b[33mwarning\x1b[0m: unused variable: `x`\n \x1b[34m-->\x1b[0m src/main.rs:2:9\n"
+        self.assertEqual(parse(coloured), [("src/main.rs", "2")])
+
+
+class ScriptTest(unittest.TestCase):
+
+    def test_unused_alias_on_mixed_mix_log(self):
+        # Regression: this used to be sniffed as ruff output and rejected.
+        code, stdout, stderr = run_script(MIXED_MIX_LOG, "--unused-alias")
+        self.assertEqual(code, 0, stderr)
+        entries = json.loads(stdout)
+        self.assertEqual([(e["fileWithPath"], e["lineNumber"]) for e in entries], [("lib/foo.ex", "3")])
+
+    def test_match_on_mixed_mix_log(self):
+        code, stdout, stderr = run_script(MIXED_MIX_LOG, "--match", "unused alias")
+        self.assertEqual(code, 0, stderr)
+        self.assertEqual([e["fileWithPath"] for e in json.loads(stdout)], ["lib/foo.ex"])
+
+    def test_elixir_flags_reject_other_formats(self):
+        code, _, stderr = run_script(RUFF_LOG, "--unused-alias", "--format", "ruff")
+        self.assertEqual(code, 2)
+        self.assertIn("--match", stderr)
+
+
+class CommentPrefixTest(unittest.TestCase):
+
+    def test_prefix_by_extension(self):
+        self.assertEqual(comment_prefix_for("lib/foo.ex"), "# ")
+        self.assertEqual(comment_prefix_for("app/x.py"), "# ")
+        self.assertEqual(comment_prefix_for("src/a.ts"), "// ")
+        self.assertEqual(comment_prefix_for("src/main.rs"), "// ")
+        self.assertEqual(comment_prefix_for("src/App.TSX"), "// ")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+Offline checks for llmScheduler.py against fakeGeminiServer.py.
+
+Each test starts the fake server on a free local port with a fault plan and
+drives RequestScheduler.stream_text() through a real google.genai Client
+(backoff sleeps are recorded instead of slept), or llm.py itself:
+
+    testLlmScheduler.py            # or: python3 -m unittest testLlmScheduler
+    testLlmScheduler.py -v
+
+The server tests need the google-genai package, like llm.py; the token bucket
+tests do not.
+"""
+
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from llmScheduler import RequestScheduler, TokenBucket, retry_after
+
+try:
+    from google import genai
+except ImportError:
+    genai = None
+
+# --- Configuration ---
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKE_SERVER_SCRIPT = os.path.join(SCRIPTS_DIR, "fakeGeminiServer.py")
+LLM_SCRIPT = os.path.join(SCRIPTS_DIR, "llm.py")
+MODEL = "gemini-test"
+WORDS = 40
+SERVER_START_TIMEOUT = 10  # seconds
+# --- End Configuration ---
+
+LISTENING_PATTERN = re.compile(r"listening on (http://\S+)")
+
+
+def full_reply(word_count=WORDS):
+    return " ".join(f"word{i}" for i in range(word_count))
+
+
+class FakeServer:
+    """Runs fakeGeminiServer.py with `args` on a free port until stopped."""
+
+    def __init__(self, *args):
+        self.log = tempfile.TemporaryFile(mode="w+")
+        self.process = subprocess.Popen([sys.executable, FAKE_SERVER_SCRIPT, "--port", "0", "--words", str(WORDS),
+                                         *args], stdout=subprocess.DEVNULL, stderr=self.log, text=True)
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        self.url = None
+        while self.url is None:
+            self.log.seek(0)
+            match = LISTENING_PATTERN.search(self.log.read())
+            if match:
+                self.url = match.group(1)
+            elif self.process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError("fakeGeminiServer.py did not start")
+            else:
+                time.sleep(0.05)
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait(timeout=5)
+        self.log.close()
+
+
+@unittest.skipIf(genai is None, "google-genai is not installed")
+class SchedulerAgainstFakeServerTest(unittest.TestCase):
+
+    def start(self, *args, max_retries=4):
+        server = FakeServer(*args)
+        self.addCleanup(server.stop)
+        client = genai.Client(api_key="fake", http_options={"base_url": server.url})
+        self.sleeps = []
+        return RequestScheduler(client, default_limit=(6000, 100), max_retries=max_retries, state_path=None,
+                                sleep=self.sleeps.append, rng=random.Random(0))
+
+    def test_plain_stream(self):
+        scheduler = self.start()
+        self.assertEqual("".join(scheduler.stream_text(MODEL, "hi")), full_reply())
+        self.assertEqual(scheduler.counters["requests"], 1)
+        self.assertEqual(scheduler.counters["retries"], 0)
+
+    def test_retries_429_and_503(self):
+        scheduler = self.start("--fail", "429,503")
+        self.assertEqual("".join(scheduler.stream_text(MODEL, "hi")), full_reply())
+        self.assertEqual(scheduler.counters["requests"], 3)
+        self.assertEqual(scheduler.counters["retries"], 2)
+        self.assertEqual(scheduler.errors, {"429": 1, "503": 1})
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_honours_retry_info_delay(self):
+        scheduler = self.start("--fail", "429", "--retry-delay", "7")
+        self.assertEqual("".join(scheduler.stream_text(MODEL, "hi")), full_reply())
+        self.assertGreaterEqual(self.sleeps[0], 7.0)
+
+    def test_resumes_cut_stream(self):
+        scheduler = self.start("--cut-after", "3")
+        self.assertEqual("".join(scheduler.stream_text(MODEL, "hi")), full_reply())
+        self.assertEqual(scheduler.counters["resumes"], 1)
+
+    def test_resume_trims_repeated_text(self):
+        scheduler = self.start("--cut-after", "3", "--resume-overlap", "3")
+        self.assertEqual("".join(scheduler.stream_text(MODEL, "hi")), full_reply())
+        self.assertEqual(scheduler.counters["resumes"], 1)
+
+    def test_non_retryable_400_fails_immediately(self):
+        scheduler = self.start("--fail", "400")
+        with self.assertRaises(Exception) as raised:
+            "".join(scheduler.stream_text(MODEL, "hi"))
+        self.assertEqual(getattr(raised.exception, "code", None), 400)
+        self.assertEqual(scheduler.counters["requests"], 1)
+        self.assertEqual(scheduler.counters["retries"], 0)
+        self.assertEqual(self.sleeps, [])
+
+    def test_gives_up_after_max_retries(self):
+        scheduler = self.start("--fail", "503,503,503", max_retries=2)
+        with self.assertRaises(Exception) as raised:
+            "".join(scheduler.stream_text(MODEL, "hi"))
+        self.assertEqual(getattr(raised.exception, "code", None), 503)
+        self.assertEqual(scheduler.counters["requests"], 3)
+
+    def test_llm_script_end_to_end(self):
+        server = FakeServer("--fail", "503", "--cut-after", "2")
+        self.addCleanup(server.stop)
+        cache_dir = tempfile.mkdtemp(prefix="testLlmScheduler-")
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        env = dict(os.environ, GEMINI_API_KEY="fake", XDG_CACHE_HOME=cache_dir)
+        result = subprocess.run([sys.executable, LLM_SCRIPT, "--base-url", server.url, "--stats", "hello"],
+                                stdin=subprocess.DEVNULL, capture_output=True, text=True, env=env, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), full_reply())
+        self.assertIn("retries 2, resumes 1", result.stderr)
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(60, 2, sleep=self.sleep, clock=self.clock)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 1.0])
+
+    def test_state_file_is_shared(self):
+        state_dir = tempfile.mkdtemp(prefix="testLlmScheduler-")
+        self.addCleanup(shutil.rmtree, state_dir, True)
+        state_path = os.path.join(state_dir, "ratelimit.json")
+        first = TokenBucket(60, 1, state_path, key=MODEL, sleep=self.sleep, clock=self.clock)
+        second = TokenBucket(60, 1, state_path, key=MODEL, sleep=self.sleep, clock=self.clock)
+        self.assertEqual(first.acquire(), 0.0)
+        self.assertAlmostEqual(second.acquire(), 1.0)
+
+    def test_trim_overlap(self):
+        self.assertEqual(RequestScheduler.trim_overlap("alpha beta gamma", " beta gamma delta"), " delta")
+        self.assertEqual(RequestScheduler.trim_overlap("alpha beta", "gamma"), "gamma")
+
+
+class RetryAfterTest(unittest.TestCase):
+
+    @staticmethod
+    def error(details):
+        return type("FakeApiError", (Exception,), {"details": details})()
+
+    def test_reads_retry_info(self):
+        retry_info = {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "30s"}
+        self.assertEqual(retry_after(self.error({"error": {"details": [retry_info]}})), 30.0)
+
+    def test_string_error_is_no_delay(self):
+        self.assertIsNone(retry_after(self.error({"error": "Resource has been exhausted"})))
+        self.assertIsNone(retry_after(self.error(None)))
+
+
+if __name__ == "__main__":
+    unittest.main()
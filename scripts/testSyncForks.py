@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+"""
+Offline checks for syncForks.py against throwaway local repos.
+
+Each test builds a bare `upstream` repo, a bare `origin` cloned from it and a
+working clone of origin with `upstream` added, then runs sync_repo() on it:
+
+    testSyncForks.py            # or: python3 -m unittest testSyncForks
+    testSyncForks.py -v
+
+Nothing outside the temporary directory is touched.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import syncForks
+
+# --- Configuration ---
+BRANCH = "main"
+FILE_NAME = "README.md"
+IDENTITY = ["-c", "user.name=syncForks test", "-c", "user.email=syncforks@example.invalid"]
+# --- End Configuration ---
+
+
+def run_git(cwd, *args):
+    """Runs git with a fixed identity and returns its stripped stdout."""
+    result = subprocess.run(["git", *IDENTITY, *args], cwd=cwd, capture_output=True, text=True,
+                            env=syncForks.GIT_ENV)
+    if result.returncode != 0:
+        raise AssertionError(f"git {' '.join(args)} failed in {cwd}: {result.stderr.strip()}")
+    return result.stdout.strip()
+
+
+def commit_file(work_dir, text, message):
+    with open(os.path.join(work_dir, FILE_NAME), "w", encoding="utf-8") as f:
+        f.write(text)
+    run_git(work_dir, "add", FILE_NAME)
+    run_git(work_dir, "commit", "--quiet", "-m", message)
+
+
+class SyncForksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="testSyncForks-")
+        self.upstream = os.path.join(self.tmp, "upstream.git")
+        self.origin = os.path.join(self.tmp, "origin.git")
+        self.author = os.path.join(self.tmp, "author")     # Pushes new upstream commits.
+        self.fork = os.path.join(self.tmp, "fork")
+
+        run_git(self.tmp, "init", "--quiet", "--bare", "--initial-branch", BRANCH, self.upstream)
+        run_git(self.tmp, "clone", "--quiet", self.upstream, self.author)
+        run_git(self.author, "checkout", "--quiet", "-b", BRANCH)
+        commit_file(self.author, "line one\n", "initial")
+        run_git(self.author, "push", "--quiet", "origin", BRANCH)
+
+        run_git(self.tmp, "clone", "--quiet", "--bare", self.upstream, self.origin)
+        run_git(self.tmp, "clone", "--quiet", self.origin, self.fork)
+        run_git(self.fork, "remote", "add", syncForks.UPSTREAM_REMOTE, self.upstream)
+        # sync_repo's merges commit with the repo's own identity.
+        run_git(self.fork, "config", "user.name", "syncForks test")
+        run_git(self.fork, "config", "user.email", "syncforks@example.invalid")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def upstream_commit(self, text, message="upstream change"):
+        commit_file(self.author, text, message)
+        run_git(self.author, "push", "--quiet", "origin", BRANCH)
+
+    def test_up_to_date(self):
+        result = syncForks.sync_repo(self.fork)
+        self.assertEqual(result["status"], "up-to-date", result)
+        self.assertEqual(result["branch"], BRANCH)
+
+    def test_merged_and_pushed(self):
+        self.upstream_commit("line one\nline two\n")
+        result = syncForks.sync_repo(self.fork, push=True)
+        self.assertEqual(result["status"], "merged", result)
+        self.assertEqual(result["commits"], 1)
+        self.assertTrue(result["pushed"])
+        upstream_head = run_git(self.upstream, "rev-parse", BRANCH)
+        self.assertEqual(run_git(self.fork, "rev-parse", BRANCH), upstream_head)
+        self.assertEqual(run_git(self.origin, "rev-parse", BRANCH), upstream_head)
+
+    def test_dry_run_reports_behind(self):
+        self.upstream_commit("line one\nline two\n")
+        before = run_git(self.fork, "rev-parse", BRANCH)
+        result = syncForks.sync_repo(self.fork, dry_run=True)
+        self.assertEqual(result["status"], "behind", result)
+        self.assertEqual(run_git(self.fork, "rev-parse", BRANCH), before)
+
+    def test_conflict_is_aborted(self):
+        self.upstream_commit("upstream line\n")
+        commit_file(self.fork, "fork line\n", "fork change")
+        before = run_git(self.fork, "rev-parse", BRANCH)
+        result = syncForks.sync_repo(self.fork)
+        self.assertEqual(result["status"], "conflicted", result)
+        self.assertEqual(run_git(self.fork, "rev-parse", BRANCH), before)
+        self.assertEqual(run_git(self.fork, "status", "--porcelain"), "")
+        self.assertFalse(os.path.exists(os.path.join(self.fork, ".git", "MERGE_HEAD")))
+
+    def test_dirty_tree_is_skipped(self):
+        self.upstream_commit("line one\nline two\n")
+        with open(os.path.join(self.fork, FILE_NAME), "a", encoding="utf-8") as f:
+            f.write("local edit\n")
+        before = run_git(self.fork, "rev-parse", BRANCH)
+        result = syncForks.sync_repo(self.fork)
+        self.assertEqual(result["status"], "dirty", result)
+        self.assertEqual(run_git(self.fork, "rev-parse", BRANCH), before)
+
+    def test_other_branch_is_restored(self):
+        run_git(self.fork, "checkout", "--quiet", "-b", "feature")
+        self.upstream_commit("line one\nline two\n")
+        result = syncForks.sync_repo(self.fork)
+        self.assertEqual(result["status"], "merged", result)
+        self.assertEqual(run_git(self.fork, "symbolic-ref", "--short", "HEAD"), "feature")
+
+    def test_detached_head_is_restored(self):
+        detached_at = run_git(self.fork, "rev-parse", "HEAD")
+        run_git(self.fork, "checkout", "--quiet", "--detach", detached_at)
+        self.upstream_commit("line one\nline two\n")
+        result = syncForks.sync_repo(self.fork)
+        self.assertEqual(result["status"], "merged", result)
+        self.assertEqual(run_git(self.fork, "rev-parse", "HEAD"), detached_at)
+        self.assertEqual(run_git(self.fork, "rev-parse", BRANCH), run_git(self.upstream, "rev-parse", BRANCH))
+        with self.assertRaises(AssertionError):
+            run_git(self.fork, "symbolic-ref", "--quiet", "HEAD")
+
+    def test_discover_repos_finds_forks_only(self):
+        plain = os.path.join(self.tmp, "plain")
+        run_git(self.tmp, "init", "--quiet", plain)
+        self.assertEqual(syncForks.discover_repos([self.tmp]), [self.fork])
+
+
+if __name__ == "__main__":
+    unittest.main()
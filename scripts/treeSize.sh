@@ -23,6 +23,38 @@ format_size() {
     fi
 }
 
+# Path to the shared walker. It prunes deps/, _build/, node_modules/, .git and
+# .gitignore'd directories, and computes every directory's size summary in one walk.
+SCRIPT_DIR=$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)
+FILE_WALK_SCRIPT="$SCRIPT_DIR/fileWalk.py"
+
+# Per-tree lookup tables filled by load_tree:
+#   DIR_SUMMARY[dir]  - "size ext" lines for the files directly in dir
+#   DIR_CHILDREN[dir] - newline-separated, sorted list of non-ignored subdirectories
+declare -A DIR_SUMMARY
+declare -A DIR_CHILDREN
+
+# Walks a whole tree once via fileWalk.py and fills the lookup tables.
+# Arguments:
+#   $1: root directory
+load_tree() {
+    local root="$1"
+    DIR_SUMMARY=()
+    DIR_CHILDREN=()
+
+    local kind path ext size parent
+    while IFS=$'\t' read -r kind path ext size; do
+        if [[ "$kind" == "D" ]]; then
+            if [[ "$path" != "$root" ]]; then
+                parent="${path%/*}"
+                DIR_CHILDREN["$parent"]+="$path"$'\n'
+            fi
+        else
+            DIR_SUMMARY["$path"]+="$size $ext"$'\n'
+        fi
+    done < <(python3 "$FILE_WALK_SCRIPT" "$root" --tree-sizes)
+}
+
 # The core recursive function to process a directory
 # Arguments:
 #   $1: directory_path
@@ -33,28 +65,9 @@ process_directory() {
     local prefix="$2"
     local is_last="$3"
 
-    # --- 1. Calculate and format size summary for files in the current directory ---
-    local summary
-    # The heart of the size calculation:
-    # find: gets size and filename for files (-maxdepth 1) in the current directory.
-    # awk: sums the sizes for each unique extension.
-    # sort: sorts the extensions alphabetically for consistent output.
-    summary=$(find "$dir_path" -maxdepth 1 -type f -printf "%s %f\n" 2>/dev/null |
-        awk '
-        {
-            size = $1
-            filename = $2
-            ext = ".<no_ext>"
-            if (match(filename, /\.[^./]+$/)) {
-                ext = substr(filename, RSTART)
-            }
-            total[ext] += size
-        }
-        END {
-            for (e in total) {
-                print total[e], e
-            }
-        }' | sort -k2)
+    # --- 1. Format size summary for files in the current directory ---
+    # Totals per extension come from load_tree, already sorted by extension.
+    local summary="${DIR_SUMMARY[$dir_path]%$'\n'}"
 
     local summary_string=""
     if [[ -n "$summary" ]]; then
@@ -82,10 +95,11 @@ process_directory() {
 
 
     # --- 3. Recurse into subdirectories ---
-    local subdirs
+    local subdirs=()
     # Read subdirectories into an array to determine the last one
-    # The `|| true` prevents the script from exiting if find returns no results
-    subdirs=($(find "$dir_path" -maxdepth 1 -mindepth 1 -type d 2>/dev/null | sort || true))
+    if [[ -n "${DIR_CHILDREN[$dir_path]}" ]]; then
+        mapfile -t subdirs <<< "${DIR_CHILDREN[$dir_path]%$'\n'}"
+    fi
     local num_subdirs=${#subdirs[@]}
 
     for i in "${!subdirs[@]}"; do
@@ -137,7 +151,12 @@ TMP2=$(mktemp)
 trap 'rm -f "$TMP1" "$TMP2"' EXIT
 
 # Process each directory and send its output to the corresponding temp file
+# Strip trailing slashes so paths match the walker's "parent/child" keys
+[[ "$DIR1" != "/" ]] && DIR1="${DIR1%/}"
+[[ "$DIR2" != "/" ]] && DIR2="${DIR2%/}"
+load_tree "$DIR1"
 process_directory "$DIR1" "" "true" > "$TMP1"
+load_tree "$DIR2"
 process_directory "$DIR2" "" "true" > "$TMP2"
 
 # Use `paste` to merge the two files side-by-side for comparison
@@ -1,25 +1,14 @@
 #!/bin/bash
 
-# Navigate to your repository directory (adjust if needed)
-# cd /path/to/your/forked/repo
+# Syncs the fork in the current directory (or the repos/directories given)
+# with its upstream and pushes the result to origin.
+# Thin wrapper around syncForks.py, which detects the default branch and can
+# sync many forks at once; see `syncForks.py --help`.
 
-echo "Fetching changes from upstream..."
-git fetch upstream
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
-echo "Switching to maaster branch..."
-git checkout master # or master
-
-echo "Merging upstream/master into main..."
-git merge upstream/maaster # or upstream/master
-
-if [ $? -eq 0 ]; then
-    echo "Merge successful. Pushing to origin..."
-    git push origin master # or origin master
-else
-    echo "Merge had conflicts. Please resolve them manually and then push."
-    echo "To resolve conflicts: git status, edit files, git add ., git commit"
-    echo "Then: git push origin maaster"
+if [ $# -eq 0 ]; then
+    set -- .
 fi
 
-echo "Fork update process complete."
-
+exec python3 "$SCRIPT_DIR/syncForks.py" --push "$@"
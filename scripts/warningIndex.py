@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+
+"""
+Indexes saved `mix compile` logs (e.g. my_warnings.txt from saveWarnings.py)
+into a small SQLite store, so repeated questions do not re-run the regex over
+the whole log:
+
+    warningIndex.py build my_warnings.txt --name today
+    warningIndex.py query --group-by file --limit 20
+    warningIndex.py query --category undefined_or_private --group-by module
+    warningIndex.py query --file 'lib/my_app/accounts/*' --grep Repo
+    warningIndex.py diff yesterday today
+    warningIndex.py builds
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from findWarningsByPrefix import iter_warnings
+
+# --- Configuration ---
+DEFAULT_DB_FILENAME = "warnings.db"
+DEFAULT_LIMIT = 50
+# --- End Configuration ---
+
+# First match wins; anything else is 'other'.
+CATEGORY_PATTERNS = [
+    ("unused_alias", re.compile(r"^unused alias ")),
+    ("unused_import", re.compile(r"^unused import ")),
+    ("unused_variable", re.compile(r"^variable \"[^\"]+\" is unused")),
+    ("unused_function", re.compile(r"^(?:function|macro) \S+ is unused")),
+    ("undefined_or_private", re.compile(r" is undefined or private")),
+    ("undefined_module", re.compile(r" is undefined \(module \S+ is not available")),
+    ("undefined", re.compile(r"(?:^undefined | is undefined)")),
+    ("deprecated", re.compile(r" is deprecated")),
+    ("unused", re.compile(r" is unused")),
+]
+# The remote module of a call, e.g. "MyApp.Repo.get/2 is undefined or private" -> "MyApp.Repo"
+CALL_MODULE_PATTERN = re.compile(r"\b([A-Z][\w]*(?:\.[A-Z][\w]*)*)\.[a-z_][\w?!]*/\d+")
+
+GROUP_COLUMNS = {"file": "file", "category": "category", "module": "module", "message": "message"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    source TEXT,
+    created TEXT NOT NULL,
+    warning_count INTEGER NOT NULL
+);
+-- Paths, messages, modules and categories repeat heavily across warnings and
+-- builds, so each distinct string is stored once and warnings hold integer ids.
+CREATE TABLE IF NOT EXISTS strings (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS warnings (
+    build_id INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    category_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    col INTEGER,
+    module_id INTEGER,
+    message_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS warnings_by_category ON warnings(build_id, category_id);
+CREATE INDEX IF NOT EXISTS warnings_by_file ON warnings(build_id, file_id);
+CREATE VIEW IF NOT EXISTS warning_rows AS
+    SELECT w.build_id, c.text AS category, f.text AS file, w.line, w.col, m.text AS module, msg.text AS message
+    FROM warnings w
+    JOIN strings c ON c.id = w.category_id
+    JOIN strings f ON f.id = w.file_id
+    LEFT JOIN strings m ON m.id = w.module_id
+    JOIN strings msg ON msg.id = w.message_id;
+"""
+
+
+def classify(message):
+    """Returns the category name for a warning message."""
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(message):
+            return category
+    return "other"
+
+
+def call_module(message, context):
+    """Returns the module a warning is about: the called module if any, else the '└─' context's module."""
+    match = CALL_MODULE_PATTERN.search(message)
+    if match:
+        return match.group(1)
+    if context:
+        # Context is e.g. "MyApp.Foo.bar/2" or "MyApp.Foo (module)".
+        match = re.match(r"([A-Z][\w.]*?)(?:\.[a-z_][\w?!]*/\d+|\s|$)", context)
+        if match:
+            return match.group(1)
+    return None
+
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def build_index(conn, log_path, name):
+    """
+    Parses a compile log once and stores every warning under build `name`.
+
+    An existing build with the same name is replaced.
+
+    Returns:
+        int: The number of warnings stored.
+    """
+    string_ids = dict(conn.execute("SELECT text, id FROM strings"))
+    new_strings = []
+
+    def intern(text):
+        if text is None:
+            return None
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = len(string_ids) + 1
+            string_ids[text] = string_id
+            new_strings.append((string_id, text))
+        return string_id
+
+    # Classification depends only on the message, so do it once per distinct message.
+    classified = {}
+    rows = []
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        for w in iter_warnings(f):
+            message = w["message"]
+            category_id = classified.get(message)
+            if category_id is None:
+                category_id = classified[message] = intern(classify(message))
+            rows.append((category_id, intern(w["fileWithPath"]), w["lineNumber"], w["column"],
+                         intern(call_module(message, w["context"])), intern(message)))
+
+    with conn:
+        conn.execute("DELETE FROM builds WHERE name = ?", (name,))
+        conn.executemany("INSERT INTO strings (id, text) VALUES (?, ?)", new_strings)
+        cursor = conn.execute(
+            "INSERT INTO builds (name, source, created, warning_count) VALUES (?, ?, ?, ?)",
+            (name, os.path.abspath(log_path), time.strftime("%Y-%m-%dT%H:%M:%S"), len(rows))
+        )
+        build_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO warnings (build_id, category_id, file_id, line, col, module_id, message_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((build_id,) + row for row in rows)
+        )
+    return len(rows)
+
+
+def resolve_build(conn, name):
+    """Returns the id of build `name`, or of the newest build if `name` is None. Exits if missing."""
+    if name is None:
+        row = conn.execute("SELECT id FROM builds ORDER BY id DESC LIMIT 1").fetchone()
+        if row is None:
+            print("Error: The index is empty. Run 'warningIndex.py build LOG' first.", file=sys.stderr)
+            sys.exit(1)
+    else:
+        row = conn.execute("SELECT id FROM builds WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            print(f"Error: No build named '{name}' in the index.", file=sys.stderr)
+            sys.exit(1)
+    return row[0]
+
+
+def build_filters(args):
+    """Turns the shared filter flags into an SQL WHERE fragment and parameters."""
+    clauses = []
+    params = []
+    if args.category:
+        clauses.append(f"category IN ({', '.join('?' for _ in args.category)})")
+        params.extend(args.category)
+    if args.file:
+        clauses.append("file GLOB ?")
+        params.append(args.file)
+    if args.module:
+        clauses.append("(module = ? OR module LIKE ?)")
+        params.extend([args.module, args.module + ".%"])
+    if args.grep:
+        clauses.append("instr(message, ?) > 0")
+        params.append(args.grep)
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+
+def run_query(conn, args):
+    build_id = resolve_build(conn, args.build)
+    where, params = build_filters(args)
+    if args.group_by:
+        column = GROUP_COLUMNS[args.group_by]
+        rows = conn.execute(
+            f"SELECT {column}, COUNT(*) AS n FROM warning_rows WHERE build_id = ?{where} "
+            f"GROUP BY {column} ORDER BY n DESC, {column} LIMIT ?",
+            [build_id] + params + [args.limit]
+        ).fetchall()
+        if args.json:
+            print(json.dumps([{args.group_by: key, "count": n} for key, n in rows], indent=2))
+        else:
+            for key, n in rows:
+                print(f"{n:>7}  {key}")
+        return
+
+    rows = conn.execute(
+        f"SELECT category, file, line, col, module, message FROM warning_rows WHERE build_id = ?{where} "
+        f"ORDER BY file, line LIMIT ?",
+        [build_id] + params + [args.limit]
+    ).fetchall()
+    if args.json:
+        keys = ["category", "fileWithPath", "lineNumber", "column", "module", "message"]
+        print(json.dumps([dict(zip(keys, row)) for row in rows], indent=2))
+    else:
+        for category, file_path, line, col, _, message in rows:
+            location = f"{file_path}:{line}" + (f":{col}" if col else "")
+            print(f"{location}  [{category}] {message}")
+
+
+def run_diff(conn, args):
+    """
+    Compares two builds. Warnings are matched on (file, category, message) with
+    multiplicity, so line shifts from unrelated edits do not count as changes.
+    """
+    old_id = resolve_build(conn, args.old)
+    new_id = resolve_build(conn, args.new)
+    where, params = build_filters(args)
+
+    def counts(build_id):
+        return {
+            (file_path, category, message): (n, line)
+            for file_path, category, message, n, line in conn.execute(
+                f"SELECT file, category, message, COUNT(*), MIN(line) FROM warning_rows "
+                f"WHERE build_id = ?{where} GROUP BY file, category, message",
+                [build_id] + params
+            )
+        }
+
+    old_counts = counts(old_id)
+    new_counts = counts(new_id)
+    added = []
+    fixed = []
+    for key in old_counts.keys() | new_counts.keys():
+        old_n = old_counts.get(key, (0, None))[0]
+        new_n, new_line = new_counts.get(key, (0, None))
+        line = new_line if new_line is not None else old_counts[key][1]
+        if new_n > old_n:
+            added.append((key, new_n - old_n, line))
+        elif old_n > new_n:
+            fixed.append((key, old_n - new_n, line))
+    added.sort(key=lambda item: (item[0][0], item[2]))
+    fixed.sort(key=lambda item: (item[0][0], item[2]))
+
+    if args.json:
+        def to_json(items):
+            return [{"fileWithPath": f, "category": c, "message": m, "count": n, "lineNumber": line}
+                    for (f, c, m), n, line in items]
+        print(json.dumps({"added": to_json(added), "fixed": to_json(fixed)}, indent=2))
+        return
+
+    by_category = {}
+    for items, sign in ((added, 1), (fixed, -1)):
+        for (_, category, _), n, _ in items:
+            by_category[category] = by_category.get(category, 0) + sign * n
+    print(f"{args.old} -> {args.new}: +{sum(n for _, n, _ in added)} new, -{sum(n for _, n, _ in fixed)} fixed")
+    for category, delta in sorted(by_category.items()):
+        if delta:
+            print(f"  {category:<22} {delta:+d}")
+    for label, items in (("+", added), ("-", fixed)):
+        for (file_path, category, message), n, line in items[:args.limit]:
+            suffix = f" (x{n})" if n > 1 else ""
+            print(f"{label} {file_path}:{line}  [{category}] {message}{suffix}")
+
+
+def list_builds(conn, args):
+    rows = conn.execute("SELECT name, created, warning_count, source FROM builds ORDER BY id").fetchall()
+    if args.json:
+        print(json.dumps([dict(zip(["name", "created", "warnings", "source"], row)) for row in rows], indent=2))
+        return
+    for name, created, count, source in rows:
+        print(f"{name:<24} {created}  {count:>8} warnings  {source}")
+
+
+def add_filter_arguments(parser):
+    parser.add_argument("--category", action="append", help="Only this category (repeatable), e.g. unused_alias.")
+    parser.add_argument("--file", metavar="GLOB", help="Only files matching this glob, e.g. 'lib/my_app/*'.")
+    parser.add_argument("--module", help="Only warnings about this module (or its submodules).")
+    parser.add_argument("--grep", metavar="TEXT", help="Only messages containing TEXT.")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help=f"Maximum rows to print. Defaults to {DEFAULT_LIMIT}.")
+    parser.add_argument("--json", action="store_true", help="Output JSON.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Indexes saved compile logs once and answers warning queries from the index.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_DB_FILENAME,
+        help=f"Index file. Defaults to '{DEFAULT_DB_FILENAME}' in the current directory."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Parse a compile log into the index.")
+    build_parser.add_argument("log", nargs="?", default="my_warnings.txt", help="Compile log. Defaults to 'my_warnings.txt'.")
+    build_parser.add_argument("--name", help="Build name (replaces an existing build). Defaults to a timestamp.")
+
+    query_parser = subparsers.add_parser("query", help="List or count warnings in a build.")
+    query_parser.add_argument("--build", help="Build name. Defaults to the newest build.")
+    query_parser.add_argument("--group-by", choices=sorted(GROUP_COLUMNS), help="Print counts per group instead of warnings.")
+    add_filter_arguments(query_parser)
+
+    diff_parser = subparsers.add_parser("diff", help="Show warnings added and fixed between two builds.")
+    diff_parser.add_argument("old", help="Older build name.")
+    diff_parser.add_argument("new", help="Newer build name.")
+    add_filter_arguments(diff_parser)
+
+    builds_parser = subparsers.add_parser("builds", help="List indexed builds.")
+    builds_parser.add_argument("--json", action="store_true", help="Output JSON.")
+
+    args = parser.parse_args()
+
+    try:
+        conn = connect(args.db)
+    except sqlite3.Error as e:
+        print(f"Error: Cannot open index '{args.db}': {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "build":
+        name = args.name or time.strftime("%Y-%m-%dT%H:%M:%S")
+        try:
+            count = build_index(conn, args.log, name)
+        except FileNotFoundError:
+            print(f"Error: Compile log '{args.log}' not found.", file=sys.stderr)
+            sys.exit(1)
+        except IOError as e:
+            print(f"Error reading compile log '{args.log}': {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Indexed {count} warnings from '{args.log}' as build '{name}' in '{args.db}'.", file=sys.stderr)
+    elif args.command == "query":
+        run_query(conn, args)
+    elif args.command == "diff":
+        run_diff(conn, args)
+    else:
+        list_builds(conn, args)
+
+
+if __name__ == "__main__":
+    main()
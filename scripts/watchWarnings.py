@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+
+"""
+Long-running watch mode for the warning pipeline.
+
+Instead of spawning a fresh `mix compile` per fixWarnings.py cycle, this
+watches the project (inotify, or mtime polling where inotify is unavailable),
+runs an incremental `mix compile` when source files change, parses the
+streamed output with findWarningsByPrefix.iter_warnings() and keeps the
+current warnings per file in memory. The map is served over a local Unix
+socket, so editor integrations can ask for warnings without compiling:
+
+    watchWarnings.py serve                 # in the project root
+    watchWarnings.py get lib/my_app/foo.ex
+    watchWarnings.py get                   # every file with warnings
+    watchWarnings.py status
+
+Protocol: one JSON object per line on the socket, one JSON reply per line.
+    {"op": "get", "file": "lib/foo.ex"} -> {"ok": true, "file": ..., "warnings": [...]}
+    {"op": "all"}                       -> {"ok": true, "files": {path: [...]}}
+    {"op": "status"}                    -> {"ok": true, "compiles": ..., ...}
+
+An incremental compile only reports warnings for modules it recompiled, so a
+file's entry is replaced when the output mentions it and evicted when a
+successful compile came back clean for it: when mix recompiled it (the
+`--verbose` "Compiled <file>" lines, which include dependents of an edited
+module) or when the file itself changed or was deleted. Deleting or moving
+away a directory evicts every file under it.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import re
+import select
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from fileWalk import walk_tree, file_extension
+from findWarningsByPrefix import iter_warnings
+from ignoreMatch import IgnoreMatcher
+
+# --- Configuration ---
+DEFAULT_SOCKET_FILENAME = ".watchWarnings.sock"
+DEFAULT_EXTENSIONS = [".ex", ".exs", ".eex", ".heex"]
+DEFAULT_DEBOUNCE_SECONDS = 0.3   # Wait for this much quiet after a change before compiling.
+DEFAULT_POLL_INTERVAL = 1.0      # Seconds between scans in polling mode.
+# --- End Configuration ---
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+# Printed per recompiled source file by `mix compile --verbose`.
+COMPILED_PATTERN = re.compile(r"^Compiled (\S+)$")
+
+
+class InotifyWatcher:
+    """Recursive inotify watch of the non-ignored directories under `root`."""
+
+    def __init__(self, root, matcher, extensions):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.root = root
+        self.matcher = matcher
+        self.extensions = extensions
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}  # watch descriptor -> directory path
+        self._add_tree(root)
+
+    def _add_watch(self, dir_path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            print(f"Warning: Cannot watch '{dir_path}': {os.strerror(errno)}", file=sys.stderr)
+            return
+        self._dirs[wd] = dir_path
+
+    def _add_tree(self, top):
+        for dir_path, _, _ in walk_tree(top, self.matcher):
+            self._add_watch(dir_path)
+
+    def _drop_tree(self, top):
+        """Removes the watches of a directory moved away; a move back in re-adds them under the new path."""
+        prefix = top + os.sep
+        for wd, dir_path in list(self._dirs.items()):
+            if dir_path == top or dir_path.startswith(prefix):
+                self._libc.inotify_rm_watch(self.fd, wd)
+                self._dirs.pop(wd, None)
+
+    def _is_source(self, path):
+        return file_extension(path) in self.extensions and not self.matcher.is_ignored(path, False)
+
+    def wait(self, timeout):
+        """
+        Blocks up to `timeout` seconds (None = forever) for changes.
+
+        Returns:
+            set: Changed source file paths (empty on timeout). On a queue
+                 overflow the whole tree is rescanned and `{None}` is returned,
+                 meaning "anything may have changed".
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                self._add_tree(self.root)
+                changed.add(None)
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            dir_path = self._dirs.get(wd)
+            if dir_path is None or not name:
+                continue
+            path = os.path.join(dir_path, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_DELETE | IN_MOVED_FROM):
+                    # Reported as changed so everything under it is evicted.
+                    changed.add(path)
+                    if mask & IN_MOVED_FROM:
+                        self._drop_tree(path)
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO) and not self.matcher.is_ignored(path, True):
+                    self._add_tree(path)
+                    # Files may have landed in the new directory before its watch existed.
+                    for _, _, files in walk_tree(path, self.matcher):
+                        changed.update(entry.path for entry in files if self._is_source(entry.path))
+                continue
+            if self._is_source(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher comparing (mtime, size) snapshots of the source files."""
+
+    def __init__(self, root, matcher, extensions, interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.matcher = matcher
+        self.extensions = extensions
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for _, _, files in walk_tree(self.root, self.matcher):
+            for entry in files:
+                if file_extension(entry.name) not in self.extensions:
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            snapshot = self._scan()
+            old = self._snapshot
+            self._snapshot = snapshot
+            changed = {path for path in snapshot.keys() | old.keys() if snapshot.get(path) != old.get(path)}
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def make_watcher(root, matcher, extensions, force_poll=False, interval=DEFAULT_POLL_INTERVAL):
+    if not force_poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, matcher, extensions)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}); falling back to polling every {interval}s.", file=sys.stderr)
+    return PollingWatcher(root, matcher, extensions, interval)
+
+
+class WarningState:
+    """The live file -> warnings map, shared between the compile loop and socket handlers."""
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._warnings = {}
+        self.compiles = 0
+        self.compiling = False
+        self.last_compile_seconds = None
+        self.last_exit_code = None
+        self.started = time.time()
+
+    def normalize(self, path):
+        """Maps an absolute or root-relative path to the root-relative form mix prints."""
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.root)
+        return os.path.normpath(path)
+
+    def apply_compile(self, warnings, changed_files, compile_ok=True, compiled_files=()):
+        """
+        Replaces the entries for every file the compile reported on, and evicts
+        recompiled files, changed files (or everything under changed
+        directories) that produced no warnings this time. A failed compile
+        stops early, so its silence about a file proves nothing: then entries
+        are only replaced.
+        """
+        by_file = {}
+        for warning in warnings:
+            entry = {key: warning[key] for key in ("lineNumber", "column", "message", "context")}
+            by_file.setdefault(self.normalize(warning["fileWithPath"]), []).append(entry)
+        with self._lock:
+            if not compile_ok:
+                self._warnings.update(by_file)
+                return
+            if changed_files is None:
+                self._warnings = by_file
+                return
+            for path in changed_files:
+                path = self.normalize(path)
+                prefix = path + os.sep
+                for known in [known for known in self._warnings if known == path or known.startswith(prefix)]:
+                    del self._warnings[known]
+            for path in compiled_files:
+                self._warnings.pop(self.normalize(path), None)
+            self._warnings.update(by_file)
+
+    def begin_compile(self):
+        with self._lock:
+            self.compiling = True
+
+    def finish_compile(self, exit_code, seconds):
+        with self._lock:
+            self.compiling = False
+            if exit_code is not None:
+                self.compiles += 1
+                self.last_exit_code = exit_code
+                self.last_compile_seconds = seconds
+
+    def get(self, path):
+        with self._lock:
+            return list(self._warnings.get(self.normalize(path), []))
+
+    def all(self):
+        with self._lock:
+            return {path: list(entries) for path, entries in sorted(self._warnings.items())}
+
+    def status(self):
+        with self._lock:
+            return {
+                "root": self.root,
+                "files": len(self._warnings),
+                "warnings": sum(len(entries) for entries in self._warnings.values()),
+                "compiles": self.compiles,
+                "compiling": self.compiling,
+                "last_compile_seconds": self.last_compile_seconds,
+                "last_exit_code": self.last_exit_code,
+                "uptime_seconds": round(time.time() - self.started, 1),
+            }
+
+
+def run_compile(state, extra_args=None):
+    """
+    Runs `mix compile --verbose` in the project root, parsing its output as it streams.
+
+    Returns:
+        tuple: (warnings, compiled) - the warnings reported (dicts from
+               iter_warnings) and the set of files mix says it recompiled,
+               or None if mix could not be run.
+    """
+    command = ["mix", "compile", "--verbose"] + (extra_args or [])
+    start = time.perf_counter()
+    state.begin_compile()
+    try:
+        process = subprocess.Popen(
+            command, cwd=state.root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, errors="replace"
+        )
+    except FileNotFoundError:
+        print("Error: The 'mix' command was not found. Is Elixir installed and in your PATH?", file=sys.stderr)
+        state.finish_compile(None, None)
+        return None
+    compiled = set()
+
+    def note_compiled(lines):
+        for line in lines:
+            match = COMPILED_PATTERN.match(line.rstrip("\n"))
+            if match:
+                compiled.add(match.group(1))
+            yield line
+
+    with process.stdout:
+        warnings = list(iter_warnings(note_compiled(process.stdout)))
+    exit_code = process.wait()
+    state.finish_compile(exit_code, round(time.perf_counter() - start, 3))
+    return warnings, compiled
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        state = self.server.state
+        for raw in self.rfile:
+            try:
+                request = json.loads(raw)
+                op = request.get("op")
+                if op == "get":
+                    reply = {"ok": True, "file": state.normalize(request["file"]),
+                             "warnings": state.get(request["file"])}
+                elif op == "all":
+                    reply = {"ok": True, "files": state.all()}
+                elif op == "status":
+                    reply = dict(state.status(), ok=True)
+                else:
+                    reply = {"ok": False, "error": f"Unknown op {op!r}. Expected 'get', 'all' or 'status'."}
+            except (ValueError, AttributeError, KeyError, TypeError) as e:
+                reply = {"ok": False, "error": f"Bad request: {e}"}
+            try:
+                self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+
+class WarningServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, state):
+        self.state = state
+        super().__init__(socket_path, RequestHandler)
+
+
+def claim_socket_path(socket_path):
+    """Removes a stale socket left by a dead daemon. Exits if a daemon is still listening."""
+    if not os.path.exists(socket_path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.unlink(socket_path)
+        return
+    finally:
+        probe.close()
+    print(f"Error: A watchWarnings.py daemon is already listening on '{socket_path}'.", file=sys.stderr)
+    sys.exit(1)
+
+
+def summarize(warnings, changed_files, state):
+    changed = "all files" if changed_files is None else f"{len(changed_files)} changed file(s)"
+    status = state.status()
+    print(f"watchWarnings.py: compiled {changed} in {state.last_compile_seconds}s "
+          f"(exit {state.last_exit_code}): {len(warnings)} reported, "
+          f"{status['warnings']} warnings live in {status['files']} files.", file=sys.stderr)
+
+
+def serve(args):
+    root = os.path.abspath(args.root)
+    if not os.path.isfile(os.path.join(root, "mix.exs")):
+        print(f"Warning: No mix.exs in '{root}'; 'mix compile' will probably fail.", file=sys.stderr)
+    socket_path = os.path.abspath(args.socket or os.path.join(root, DEFAULT_SOCKET_FILENAME))
+    extensions = {ext if ext.startswith(".") else f".{ext}" for ext in args.ext}
+
+    state = WarningState(root)
+    matcher = IgnoreMatcher(root)
+    watcher = make_watcher(root, matcher, extensions, force_poll=args.poll, interval=args.interval)
+
+    claim_socket_path(socket_path)
+    server = WarningServer(socket_path, state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"watchWarnings.py: watching '{root}' ({type(watcher).__name__}), serving on '{socket_path}'.",
+          file=sys.stderr)
+
+    try:
+        # The first compile rebuilds everything so the map starts complete;
+        # an incremental compile would only report what happens to be stale.
+        result = run_compile(state, None if args.no_initial_force else ["--force"])
+        if result is None:
+            sys.exit(1)
+        warnings, _ = result
+        state.apply_compile(warnings, None, compile_ok=state.last_exit_code == 0)
+        summarize(warnings, None, state)
+
+        while True:
+            changed = watcher.wait(None)
+            if not changed:
+                continue
+            # Debounce: editors often write a file several times in a row.
+            while True:
+                more = watcher.wait(args.debounce)
+                if not more:
+                    break
+                changed |= more
+            full_rescan = None in changed
+            result = run_compile(state)
+            if result is None:
+                continue
+            warnings, compiled = result
+            changed_files = None if full_rescan else changed
+            state.apply_compile(warnings, changed_files, compile_ok=state.last_exit_code == 0,
+                                compiled_files=compiled)
+            summarize(warnings, changed_files, state)
+    except KeyboardInterrupt:
+        print("\nwatchWarnings.py: stopping.", file=sys.stderr)
+    finally:
+        server.shutdown()
+        server.server_close()
+        watcher.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def request(socket_path, payload):
+    """Sends one request to a running daemon and returns its decoded reply."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError as e:
+        print(f"Error: No watchWarnings.py daemon on '{socket_path}' ({e}). Start one with 'watchWarnings.py serve'.",
+              file=sys.stderr)
+        sys.exit(1)
+    with client, client.makefile("rwb") as stream:
+        stream.write((json.dumps(payload) + "\n").encode("utf-8"))
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        print("Error: The daemon closed the connection without replying.", file=sys.stderr)
+        sys.exit(1)
+    return json.loads(line)
+
+
+def print_warnings(path, warnings):
+    for warning in warnings:
+        column = f":{warning['column']}" if warning["column"] else ""
+        print(f"{path}:{warning['lineNumber']}{column}: {warning['message']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Watches an Elixir project, recompiles on change and serves live warnings over a Unix socket.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--socket",
+        help=f"Socket path. Defaults to '{DEFAULT_SOCKET_FILENAME}' in the project root\n"
+             "(the current directory for 'get' and 'status')."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the watch daemon in the foreground.")
+    serve_parser.add_argument("root", nargs="?", default=".", help="Project root (where mix.exs is). Defaults to '.'.")
+    serve_parser.add_argument("--poll", action="store_true", help="Poll file mtimes instead of using inotify.")
+    serve_parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                              help=f"Polling interval in seconds. Defaults to {DEFAULT_POLL_INTERVAL}.")
+    serve_parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE_SECONDS,
+                              help=f"Quiet period before compiling, in seconds. Defaults to {DEFAULT_DEBOUNCE_SECONDS}.")
+    serve_parser.add_argument("--ext", action="append", default=None,
+                              help=f"Extension that triggers a compile (repeatable). Defaults to {', '.join(DEFAULT_EXTENSIONS)}.")
+    serve_parser.add_argument("--no-initial-force", action="store_true",
+                              help="Start with an incremental compile instead of 'mix compile --force'.")
+
+    get_parser = subparsers.add_parser("get", help="Print current warnings for files (all files if none given).")
+    get_parser.add_argument("files", nargs="*", help="Files to look up, absolute or relative to the project root.")
+    get_parser.add_argument("--json", action="store_true", help="Print the raw JSON reply.")
+
+    subparsers.add_parser("status", help="Print daemon status as JSON.")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        args.ext = args.ext or DEFAULT_EXTENSIONS
+        serve(args)
+        return
+
+    socket_path = args.socket or os.path.join(os.getcwd(), DEFAULT_SOCKET_FILENAME)
+    if args.command == "status":
+        print(json.dumps(request(socket_path, {"op": "status"}), indent=2))
+        return
+
+    if args.files:
+        # Sent as given: the daemon resolves relative paths against its project root.
+        replies = [request(socket_path, {"op": "get", "file": path}) for path in args.files]
+        files = {reply["file"]: reply["warnings"] for reply in replies}
+    else:
+        files = request(socket_path, {"op": "all"})["files"]
+    if args.json:
+        print(json.dumps(files, indent=2))
+        return
+    for path, warnings in files.items():
+        print_warnings(path, warnings)
+
+
+if __name__ == "__main__":
+    main()